@@ -0,0 +1,245 @@
+"""Benchmark the data layer and page renders as the tables grow.
+
+Usage: python benchmarks/bench_data_layer.py [--users 100 1000 10000]
+           [--progress-per-user 10] [--iterations 200] [--pages]
+           [--compare benchmarks/results/<previous>.json]
+
+For every size a scratch data directory is filled with N synthetic users
+and N * progress-per-user progress rows, then each operation is timed on
+its own. Reported per operation: throughput, p50/p99 latency and the
+peak Python heap allocated while it runs (tracemalloc, measured on a
+separate pass so it does not skew the timings). The process's peak RSS
+after each size is reported too. Results are written to
+benchmarks/results/ as JSON; --compare prints the change against an
+earlier run.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from bench_workbook import peak_rss_kib
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+LANGUAGES = ["IELTS English", "Professional English", "Urdu"]
+PAGES = ['main.py', 'pages/dashboard.py', 'pages/shop.py', 'pages/leaderboard.py']
+
+sys.path.insert(0, str(ROOT))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(operation, iterations):
+    """Time `operation(i)` per call, then re-run a few calls under tracemalloc."""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(iterations):
+            start = time.perf_counter()
+            operation(i)
+            samples.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        for i in range(min(iterations, 20)):
+            operation(iterations + i)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    total = sum(samples)
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / total if total else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'mean_ms': statistics.mean(samples) * 1000,
+        'peak_kib': peak / 1024
+    }
+
+
+def synthesize(n_users, progress_per_user, password_iterations):
+    """Fill the current data directory with synthetic users and attempts."""
+    from utils.database import transaction
+    from utils.data_manager import DataManager
+    from utils.passwords import hash_password
+    from utils.user_repository import UserRepository, USER_COLUMNS
+
+    users = UserRepository()
+    yesterday = (datetime.now().date() - timedelta(days=1)).isoformat()
+    # Everyone shares one hash; hashing N passwords would dominate setup time
+    password = hash_password('password', password_iterations)
+    rows = [
+        (f"user{i}", password, 1_000_000, 1, 0, 1, yesterday)
+        for i in range(n_users)
+    ]
+    with transaction(users.db_path) as conn:
+        conn.executemany(
+            f"INSERT INTO users ({', '.join(USER_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(USER_COLUMNS))})",
+            rows
+        )
+
+    data_manager = DataManager()
+    rng = random.Random(42)
+    with transaction(users.db_path):
+        for i in range(n_users * progress_per_user):
+            data_manager.save_progress(
+                f"user{rng.randrange(n_users)}", rng.choice(LANGUAGES), "Benchmark", rng.randrange(0, 101)
+            )
+
+
+def bench_services(n_users, iterations, password_iterations):
+    from utils.auth import Auth
+    from utils.data_manager import DataManager
+    from utils.database import get_connection
+    from utils.virtual_economy import VirtualEconomy
+
+    auth = Auth(password_iterations=password_iterations)
+    data_manager = DataManager()
+    economy = VirtualEconomy()
+    rng = random.Random(7)
+
+    def some_user(_):
+        return f"user{rng.randrange(n_users)}"
+
+    def streak(i):
+        username = some_user(i)
+        # Make every call take the "first visit today" path
+        get_connection().execute(
+            "UPDATE users SET last_login = ? WHERE username = ?",
+            ((datetime.now().date() - timedelta(days=1)).isoformat(), username)
+        )
+        economy.check_daily_streak(username)
+
+    operations = {
+        'auth.login': lambda i: auth.login(some_user(i), 'password'),
+        'auth.get_user_data': lambda i: auth.get_user_data(some_user(i)),
+        'data_manager.save_progress': lambda i: data_manager.save_progress(
+            some_user(i), rng.choice(LANGUAGES), "Benchmark", rng.randrange(0, 101)),
+        'data_manager.get_user_progress': lambda i: data_manager.get_user_progress(some_user(i)),
+        'data_manager.get_progress_summary': lambda i: data_manager.get_progress_summary(some_user(i)),
+        'data_manager.get_leaderboard': lambda i: data_manager.get_leaderboard(),
+        'economy.purchase_item': lambda i: economy.purchase_item(some_user(i), 'extra_hints'),
+        'economy.check_daily_streak': streak,
+    }
+    return {name: measure(operation, iterations) for name, operation in operations.items()}
+
+
+def bench_pages(n_users, iterations, password_iterations):
+    from streamlit.testing.v1 import AppTest
+    from utils.auth import Auth
+
+    username = f"user{n_users // 2}"
+    with contextlib.redirect_stdout(io.StringIO()):
+        token = Auth(password_iterations=password_iterations).login(username, 'password')[2]
+
+    results = {}
+    for page in PAGES:
+        app = AppTest.from_file(str(ROOT / page), default_timeout=60)
+        app.session_state.logged_in = True
+        app.session_state.username = username
+        app.session_state.session_token = token
+        app.run()  # first run pays for imports and service construction
+
+        def render(_):
+            app.run()
+            if app.exception:
+                raise RuntimeError(f"{page} failed: {app.exception[0].message}")
+        results[f"render:{page}"] = measure(render, iterations)
+    return results
+
+
+def run_size(n_users, progress_per_user, iterations, pages, password_iterations):
+    from utils.database import close_connections
+
+    workdir = tempfile.mkdtemp(prefix=f"uie-bench-{n_users}-")
+    shutil.copytree(ROOT / 'assets', Path(workdir) / 'assets')
+    shutil.copytree(ROOT / 'content', Path(workdir) / 'content')
+    os.chdir(workdir)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            synthesize(n_users, progress_per_user, password_iterations)
+        print(f"  synthesized {n_users} users / {n_users * progress_per_user} attempts "
+              f"in {time.perf_counter() - start:.1f}s")
+        results = bench_services(n_users, iterations, password_iterations)
+        if pages:
+            import streamlit as st
+            st.cache_resource.clear()
+            results.update(bench_pages(n_users, max(iterations // 10, 5), password_iterations))
+        return results
+    finally:
+        close_connections()
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_table(n_users, results, baseline=None):
+    print(f"  {'operation':<34}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>10}"
+          + (f"{'p50 vs base':>13}" if baseline else ""))
+    for name, stats in results.items():
+        line = (f"  {name:<34}{stats['ops_per_sec']:>10.0f}{stats['p50_ms']:>10.3f}"
+                f"{stats['p99_ms']:>10.3f}{stats['peak_kib']:>10.1f}")
+        previous = (baseline or {}).get(str(n_users), {}).get(name)
+        if previous and previous['p50_ms']:
+            line += f"{(stats['p50_ms'] / previous['p50_ms'] - 1) * 100:>+12.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--progress-per-user', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--pages', action='store_true', help="also time headless page renders")
+    parser.add_argument('--password-iterations', type=int, default=10_000,
+                        help="PBKDF2 cost for synthetic users (see bench_login.py for the cost sweep)")
+    parser.add_argument('--compare', help="earlier results file to compare p50 latency against")
+    parser.add_argument('--output', help="where to write results (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    peak_rss = {}
+    for n_users in args.users:
+        print(f"users={n_users}")
+        results[str(n_users)] = run_size(
+            n_users, args.progress_per_user, args.iterations, args.pages, args.password_iterations
+        )
+        print_table(n_users, results[str(n_users)], baseline)
+        peak_rss[str(n_users)] = peak_rss_kib()
+        if peak_rss[str(n_users)] is not None:
+            print(f"  peak RSS so far: {peak_rss[str(n_users)] / 1024:.1f} MiB")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(),
+            'config': vars(args),
+            'results': results,
+            'peak_rss_kib': peak_rss
+        }, f, indent=2)
+    print(f"Saved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark login latency and throughput at different password hash costs.
+
+Usage: python benchmarks/bench_login.py [--iterations 10000 100000 600000]
+           [--logins 20]
+
+For each PBKDF2 work factor a scratch database gets one user hashed at
+that cost, then three login paths are timed: a full verification (cache
+cleared before every call), a repeat login served from the verified-
+credential cache, and a wrong password.
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def time_calls(func, count):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label, samples):
+    p50 = statistics.median(samples) * 1000
+    p99 = sorted(samples)[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    print(f"  {label:<22}{len(samples) / sum(samples):>12.1f}{p50:>12.3f}{p99:>12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, nargs='+', default=[10_000, 100_000, 600_000])
+    parser.add_argument('--logins', type=int, default=20)
+    args = parser.parse_args()
+
+    from utils.auth import Auth
+    from utils.database import close_connections
+
+    for iterations in args.iterations:
+        workdir = tempfile.mkdtemp(prefix="uie-login-")
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                auth = Auth(password_iterations=iterations)
+                auth.signup('bench_user', 'secret')
+
+            print(f"iterations={iterations}")
+            print(f"  {'path':<22}{'logins/s':>12}{'p50 ms':>12}{'p99 ms':>12}")
+
+            def full_login():
+                auth.verified.clear()
+                auth.login('bench_user', 'secret')
+
+            report("full verification", time_calls(full_login, args.logins))
+            auth.login('bench_user', 'secret')
+            report("cached", time_calls(lambda: auth.login('bench_user', 'secret'), args.logins * 100))
+            report("wrong password", time_calls(lambda: auth.login('bench_user', 'wrong'), args.logins))
+        finally:
+            close_connections()
+            os.chdir(ROOT)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare whole-sheet and streaming reads of a large progress workbook.
+
+Usage: python benchmarks/bench_workbook.py [--rows 10000 100000] [--chunk-size 1000]
+
+A synthetic progress.xlsx with N rows is written for every size, then each
+reader runs in its own subprocess so that its peak resident set size
+(getrusage ru_maxrss) is measured in isolation:
+
+  pandas     pd.read_excel of the whole sheet plus a groupby
+  streaming  utils.excel_reader.summarize_progress (same report, chunked)
+  migration  the one-shot progress.xlsx -> SQLite import
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+LANGUAGES = ["IELTS English", "Professional English", "Urdu"]
+
+sys.path.insert(0, str(ROOT))
+
+
+def peak_rss_kib():
+    """Peak resident set size of this process in KiB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # bytes on macOS
+
+
+def write_workbook(path, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['username', 'language', 'module', 'score', 'completed'])
+    for i in range(rows):
+        sheet.append([f"user{i % 5000}", LANGUAGES[i % 3], "Reading", (i * 37) % 101, True])
+    workbook.save(path)
+
+
+def run_reader(method, path, chunk_size):
+    """Body of the measurement subprocess."""
+    start = time.perf_counter()
+    if method == 'pandas':
+        import pandas as pd
+        df = pd.read_excel(path)
+        df.groupby('language')['score'].agg(['count', 'mean'])
+    elif method == 'streaming':
+        from utils.excel_reader import summarize_progress
+        summarize_progress(path, chunk_size)
+    else:
+        from utils.database import close_connections
+        from utils.progress_repository import ProgressRepository
+        with tempfile.TemporaryDirectory(prefix="uie-bench-workbook-") as workdir:
+            ProgressRepository(os.path.join(workdir, 'bench.db'), legacy_file=path)
+            close_connections()
+    print(json.dumps({'seconds': time.perf_counter() - start, 'peak_rss_kib': peak_rss_kib()}))
+
+
+def measure(method, path, chunk_size):
+    output = subprocess.run(
+        [sys.executable, __file__, '--run', method, '--path', str(path), '--chunk-size', str(chunk_size)],
+        capture_output=True, text=True, check=True, cwd=ROOT
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--run', choices=['pandas', 'streaming', 'migration'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_reader(args.run, args.path, args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="uie-bench-workbook-") as workdir:
+        print(f"{'rows':>8}  {'reader':<10}{'seconds':>10}{'peak RSS MiB':>14}")
+        for rows in args.rows:
+            path = Path(workdir) / f"progress-{rows}.xlsx"
+            write_workbook(path, rows)
+            for method in ['pandas', 'streaming', 'migration']:
+                result = measure(method, path, args.chunk_size)
+                rss = result['peak_rss_kib']
+                print(f"{rows:>8}  {method:<10}{result['seconds']:>10.2f}"
+                      f"{(f'{rss / 1024:.1f}' if rss is not None else 'n/a'):>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure cold and warm rerun time of the Streamlit pages.
+
+Usage: python benchmarks/rerun_timing.py [--reruns N]
+
+Runs each page headlessly with streamlit.testing against a scratch copy of
+the data directory. The first run of a page in a fresh process is "cold"
+(module imports, service construction, schema checks); later reruns are
+"warm" and should only pay for rendering and per-user reads.
+"""
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [
+    'main.py', 'pages/dashboard.py', 'pages/shop.py',
+    'pages/leaderboard.py', 'pages/learn.py', 'pages/quiz.py'
+]
+
+
+def time_page(page, reruns, username, token):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / page), default_timeout=60)
+    app.session_state.logged_in = True
+    app.session_state.username = username
+    app.session_state.session_token = token
+
+    start = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(f"{page} failed: {app.exception[0].message}")
+
+    warm = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        warm.append(time.perf_counter() - start)
+    return cold, warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+    # streamlit.testing warns about the missing ScriptRunContext on every run
+    logging.disable(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix="uie-rerun-")
+    shutil.copytree(ROOT / 'assets', Path(workdir) / 'assets')
+    shutil.copytree(ROOT / 'content', Path(workdir) / 'content')
+    sys.path.insert(0, str(ROOT))
+    os.chdir(workdir)
+    try:
+        from utils.auth import Auth
+        auth = Auth()
+        auth.signup('bench_user', 'bench_password')
+        token = auth.login('bench_user', 'bench_password')[2]
+
+        print(f"{'page':<24}{'cold ms':>10}{'warm p50 ms':>14}{'warm max ms':>14}")
+        for page in PAGES:
+            cold, warm = time_page(page, args.reruns, 'bench_user', token)
+            print(f"{page:<24}{cold * 1000:>10.1f}{statistics.median(warm) * 1000:>14.1f}"
+                  f"{max(warm) * 1000:>14.1f}")
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
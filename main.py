@@ -1,27 +1,22 @@
 import streamlit as st
-import pandas as pd
-from utils.auth import Auth
-from utils.data_manager import DataManager
-from utils.gamification import GamificationSystem
-from utils.virtual_economy import VirtualEconomy
-from utils.motivation import show_motivation
-import os
-import json
-
-# Initialize systems
-auth = Auth()
-data_manager = DataManager()
-gamification = GamificationSystem()
-economy = VirtualEconomy()
+from utils.services import get_auth, get_data_manager, get_gamification, get_economy
+from utils.user_context import UserContext
+
+@st.cache_resource
+def load_css():
+    with open('assets/style.css') as f:
+        return f.read()
 
 # Load custom CSS
-with open('assets/style.css') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+st.markdown(f'<style>{load_css()}</style>', unsafe_allow_html=True)
 
 def main():
     if 'logged_in' not in st.session_state:
         st.session_state.logged_in = False
 
+    # Shared per process; only the services this rerun needs get built
+    auth = get_auth()
+
     if not st.session_state.logged_in:
         st.title("Language Learning Platform")
 
@@ -34,10 +29,11 @@ def main():
                 submit = st.form_submit_button("Login")
 
                 if submit:
-                    success, message = auth.login(username, password)
+                    success, message, token = auth.login(username, password)
                     if success:
                         st.session_state.logged_in = True
                         st.session_state.username = username
+                        st.session_state.session_token = token
                         st.rerun()  # Updated from experimental_rerun
                     else:
                         st.error(message)
@@ -56,20 +52,32 @@ def main():
                         st.error(message)
 
     else:
-        user_data = auth.get_user_data(st.session_state.username)
+        session, token = auth.resolve_session(st.session_state.get('session_token'))
+        if session is None:
+            st.session_state.logged_in = False
+            st.rerun()
+        st.session_state.session_token = token
+
+        data_manager = get_data_manager()
+        gamification = get_gamification()
+        economy = get_economy()
+
+        # Everything below reads the user through one context per rerun
+        context = UserContext(st.session_state.username, auth, data_manager, st.session_state)
+        user_data = context.user
 
         # Sidebar with user info and virtual economy stats
         st.sidebar.title(f"Welcome, {st.session_state.username}")
 
         # Check and display streak
-        streak = economy.check_daily_streak(st.session_state.username)
+        streak = context.check_daily_streak(economy)
         if streak > 0:
             st.sidebar.success(f"🔥 {streak} Day Streak!")
 
         # Display user stats
         col1, col2, col3 = st.sidebar.columns(3)
-        col1.metric("Level", user_data['level'])
-        col2.metric("Coins", user_data['coins'])
+        col1.metric("Level", session['level'])
+        col2.metric("Coins", user_data.coins)
         col3.metric("Streak", streak)
 
         # Quick actions
@@ -78,12 +86,16 @@ def main():
             st.switch_page("pages/shop.py")
         if st.sidebar.button("Start New Quiz"):
             st.switch_page("pages/quiz.py")
+        if st.sidebar.button("Review Questions"):
+            st.switch_page("pages/review.py")
         if st.sidebar.button("View Leaderboard"):
             st.switch_page("pages/leaderboard.py")
         if st.sidebar.button("Learning Materials"):
             st.switch_page("pages/learn.py")
         if st.sidebar.button("Logout"):
             st.session_state.logged_in = False
+            st.session_state.pop('session_token', None)
+            st.session_state.pop('cached_user', None)
             st.rerun()
 
         st.title("Dashboard")
@@ -103,9 +115,9 @@ def main():
 
         with col2:
             st.header("Your Progress")
-            progress = data_manager.get_user_progress(st.session_state.username)
-            if not progress.empty:
-                avg_score = progress['score'].mean()
+            stats = context.summary.overall()
+            if stats.attempts:
+                avg_score = stats.average
                 st.metric("Average Score", f"{avg_score:.1f}%")
 
                 # Progress bar
@@ -118,15 +130,15 @@ def main():
                     unsafe_allow_html=True
                 )
 
-        # Recent achievements and inventory
+        # Achievements and inventory
         col1, col2 = st.columns(2)
 
         with col1:
-            st.header("Recent Achievements")
-            if user_data and 'achievements' in user_data:
-                achievements = json.loads(user_data['achievements'])
+            st.header("Achievements")
+            if user_data:
+                achievements = context.achievements
                 if achievements:
-                    for achievement in achievements[-3:]:
+                    for achievement in achievements:
                         st.markdown(
                             f"""
                             <div class="achievement-badge">
@@ -142,13 +154,13 @@ def main():
 
         with col2:
             st.header("Your Items")
-            inventory = economy.get_user_inventory(st.session_state.username)
+            inventory = context.inventory
             if inventory:
                 for item in inventory:
                     st.markdown(
                         f"""
                         <div class="achievement-badge">
-                            🎁 {item['item_id']}
+                            🎁 {item.item_id}
                         </div>
                         """,
                         unsafe_allow_html=True
@@ -156,5 +168,7 @@ def main():
             else:
                 st.info("Visit the shop to get some items!")
 
+        st.session_state.backend_reads = context.reads
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,17 +1,14 @@
 import streamlit as st
-import pandas as pd
-import json
-from utils.auth import Auth
-from utils.data_manager import DataManager
-from utils.gamification import GamificationSystem
+from utils.services import get_auth, get_data_manager, get_gamification
+from utils.user_context import UserContext
+from utils.session import require_login
 
-def show_language_stats(data_manager, username, language):
-    progress = data_manager.get_user_progress(username)
-    language_progress = progress[progress['language'] == language]
+def show_language_stats(summary, language):
+    stats = summary.language(language)
     
-    if not language_progress.empty:
-        avg_score = language_progress['score'].mean()
-        completed_modules = len(language_progress)
+    if stats.attempts:
+        avg_score = stats.average
+        completed_modules = stats.attempts
         
         col1, col2 = st.columns(2)
         with col1:
@@ -31,9 +28,8 @@ def show_language_stats(data_manager, username, language):
     else:
         st.info(f"No progress recorded for {language} yet. Start learning!")
 
-def show_achievements(user_data, gamification):
+def show_achievements(achievements, gamification):
     st.subheader("Your Achievements")
-    achievements = json.loads(user_data['achievements'])
     
     if achievements:
         cols = st.columns(3)
@@ -78,23 +74,22 @@ def show_learning_path(language):
         st.markdown(f"**Level {idx}:** {module}")
 
 def main():
-    if 'logged_in' not in st.session_state or not st.session_state.logged_in:
-        st.error("Please log in first")
-        st.stop()
+    session = require_login()
 
-    auth = Auth()
-    data_manager = DataManager()
-    gamification = GamificationSystem()
+    auth = get_auth()
+    data_manager = get_data_manager()
+    gamification = get_gamification()
     
-    user_data = auth.get_user_data(st.session_state.username)
+    context = UserContext(st.session_state.username, auth, data_manager, st.session_state)
+    user_data = context.user
     
     # Header section
     st.title("Student Dashboard")
     
     # User stats in the sidebar
     st.sidebar.title(f"Welcome, {st.session_state.username}")
-    st.sidebar.write(f"Level: {user_data['level']}")
-    st.sidebar.write(f"Coins: {user_data['coins']}")
+    st.sidebar.write(f"Level: {session['level']}")
+    st.sidebar.write(f"Coins: {user_data.coins}")
     
     # Quick actions
     st.sidebar.subheader("Quick Actions")
@@ -109,28 +104,28 @@ def main():
     tab1, tab2, tab3 = st.tabs(["IELTS English", "Professional English", "Urdu"])
     
     with tab1:
-        show_language_stats(data_manager, st.session_state.username, "IELTS English")
+        show_language_stats(context.summary, "IELTS English")
         show_learning_path("IELTS English")
     
     with tab2:
-        show_language_stats(data_manager, st.session_state.username, "Professional English")
+        show_language_stats(context.summary, "Professional English")
         show_learning_path("Professional English")
     
     with tab3:
-        show_language_stats(data_manager, st.session_state.username, "Urdu")
+        show_language_stats(context.summary, "Urdu")
         show_learning_path("Urdu")
     
     # Achievements section
     st.markdown("---")
-    show_achievements(user_data, gamification)
+    show_achievements(context.achievements, gamification)
     
     # Recent activity
     st.markdown("---")
     st.subheader("Recent Activity")
-    recent_progress = data_manager.get_user_progress(st.session_state.username).tail(5)
+    recent_progress = context.summary.recent
     
-    if not recent_progress.empty:
-        for _, activity in recent_progress.iterrows():
+    if recent_progress:
+        for activity in recent_progress:
             st.markdown(
                 f"""
                 <div class="leaderboard-item">
@@ -142,5 +137,7 @@ def main():
     else:
         st.info("No recent activity. Start learning to see your progress!")
 
+    st.session_state.backend_reads = context.reads
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,56 @@
+import streamlit as st
+from utils import tracing
+from utils.session import require_login
+
+def main():
+    require_login()
+
+    st.title("Developer Metrics")
+
+    if not tracing.ENABLED:
+        st.info("Tracing is off. Start the app with UIE_TRACING=1 to collect per-operation timings.")
+        st.stop()
+
+    if 'backend_reads' in st.session_state:
+        st.metric("Backend reads on your last page render", st.session_state.backend_reads)
+
+    metrics = tracing.snapshot()
+
+    st.subheader("Operations")
+    if metrics['timers']:
+        st.dataframe(
+            [
+                {
+                    'operation': name,
+                    'calls': stats['count'],
+                    'errors': stats['errors'],
+                    'mean ms': round(stats['mean_ms'], 3),
+                    'p50 ms': round(stats['p50_ms'], 3),
+                    'p99 ms': round(stats['p99_ms'], 3),
+                    'total ms': round(stats['total_ms'], 1)
+                }
+                for name, stats in metrics['timers'].items()
+            ],
+            use_container_width=True
+        )
+    else:
+        st.write("No instrumented calls yet.")
+
+    st.subheader("Counters")
+    if metrics['counters']:
+        st.table([{'event': name, 'count': value} for name, value in metrics['counters'].items()])
+    else:
+        st.write("No counters recorded yet.")
+
+    st.subheader("Prometheus export")
+    exposition = tracing.render_prometheus()
+    st.download_button("Download metrics", exposition, file_name="metrics.txt", mime="text/plain")
+    with st.expander("Show raw metrics"):
+        st.code(exposition, language="text")
+
+    if st.button("Reset metrics"):
+        tracing.reset()
+        st.rerun()
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,28 @@
 import streamlit as st
-from utils.data_manager import DataManager
+from utils.services import get_data_manager
+from utils.session import require_login
 
 def main():
-    if 'logged_in' not in st.session_state or not st.session_state.logged_in:
-        st.error("Please log in first")
-        st.stop()
+    require_login()
 
     st.title("Leaderboard")
     
-    data_manager = DataManager()
-    leaderboard = data_manager.get_leaderboard()
+    data_manager = get_data_manager()
+
+    col1, col2 = st.columns(2)
+    language = col1.selectbox("Language", ["All Languages", "IELTS English", "Professional English", "Urdu"])
+    periods = {"All Time": "all", "This Week": "week", "This Month": "month"}
+    period = col2.selectbox("Period", list(periods.keys()))
+
+    leaderboard = data_manager.get_leaderboard(
+        language=None if language == "All Languages" else language,
+        period=periods[period]
+    )
     
     st.write("Top Performers")
+
+    if leaderboard.empty:
+        st.info("No quiz results for this period yet.")
     
     for idx, (username, score) in enumerate(leaderboard.items(), 1):
         st.markdown(
@@ -25,4 +36,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
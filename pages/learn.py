@@ -1,27 +1,9 @@
 import streamlit as st
-from utils.data_manager import DataManager
+from utils.services import get_content
+from utils.session import require_login
 
-def show_content(language, module):
-    content = {
-        "IELTS English": {
-            "Reading": "Practice reading comprehension with academic texts...",
-            "Writing": "Learn essay structures and academic writing...",
-            "Speaking": "Improve your speaking skills with practice exercises...",
-            "Listening": "Enhance your listening skills with audio exercises..."
-        },
-        "Professional English": {
-            "Business Communication": "Learn professional email writing...",
-            "Presentations": "Master the art of business presentations...",
-            "Negotiations": "Develop negotiation skills in English..."
-        },
-        "Urdu": {
-            "Basic Grammar": "Learn fundamental Urdu grammar...",
-            "Conversation": "Practice everyday Urdu conversations...",
-            "Writing": "Learn Urdu script and writing..."
-        }
-    }
-    
-    st.write(content[language][module])
+def show_content(lesson):
+    st.write(lesson['text'])
     
     # Practice exercise
     st.subheader("Practice Exercise")
@@ -30,23 +12,29 @@ def show_content(language, module):
         st.success("Exercise submitted! Great job!")
 
 def main():
-    if 'logged_in' not in st.session_state or not st.session_state.logged_in:
-        st.error("Please log in first")
-        st.stop()
+    require_login()
 
     st.title("Learning Materials")
     
+    content = get_content()
     language = st.selectbox("Select Language", ["IELTS English", "Professional English", "Urdu"])
     
-    modules = {
-        "IELTS English": ["Reading", "Writing", "Speaking", "Listening"],
-        "Professional English": ["Business Communication", "Presentations", "Negotiations"],
-        "Urdu": ["Basic Grammar", "Conversation", "Writing"]
-    }
+    # Search across every lesson and passage
+    query = st.text_input("Search materials")
+    if query:
+        results = content.search(query, language=language)
+        for item in results:
+            st.markdown(f"**{item.get('title') or item.get('question') or item['id']}** ({item['kind']})")
+        if not results:
+            st.info("No materials match your search")
     
-    module = st.selectbox("Select Module", modules[language])
+    lessons = {lesson['module']: lesson for lesson in content.lessons(language)}
+    if not lessons:
+        st.info(f"No lessons are available for {language} yet")
+        return
+    module = st.selectbox("Select Module", list(lessons))
     
-    show_content(language, module)
+    show_content(lessons[module])
 
 if __name__ == "__main__":
     main()
@@ -1,94 +1,79 @@
 import streamlit as st
-import random
-from utils.data_manager import DataManager
-from utils.gamification import GamificationSystem
-from utils.auth import Auth
-from utils.motivation import MotivationSystem
-from utils.gemini_helper import GeminiQuizSystem
-
-def get_ielts_reading_passage(topic):
-    # Sample IELTS reading passages - In production, these should come from a database
-    passages = {
-        "Academic": {
-            "Science": """
-            The Human Brain
-            
-            The human brain is the command center for the human nervous system. It receives signals from the body's sensory organs and outputs information to the muscles. The human brain has the same basic structure as other mammal brains but is larger in relation to body size than any other brains.
-            
-            The brain contains approximately 86 billion nerve cells (neurons) — the "gray matter." These neurons are connected by trillions of connections, or synapses. The brain has three main parts: the cerebrum, cerebellum, and brainstem. The cerebrum is the largest part of the brain. It is associated with higher order functioning, including thinking, perceiving, planning, and understanding language.
-            """,
-            "Environment": """
-            Climate Change Impact
-            
-            Climate change poses one of the most serious threats to the world's environments and human societies. Rising global temperatures have been linked to changes in weather patterns, leading to more frequent extreme weather events and shifting precipitation patterns.
-            
-            These changes affect agriculture, water resources, and ecosystems worldwide. Scientists have observed numerous effects of climate change, including rising sea levels, melting glaciers, and changes in the timing of seasonal events. The impact on biodiversity has been particularly severe.
-            """
-        },
-        "General": {
-            "Society": """
-            The Evolution of Social Media
-            
-            Social media has transformed how people communicate and share information in the 21st century. What started as simple platforms for connecting with friends has evolved into complex networks that influence everything from personal relationships to global politics.
-            
-            The first social media platforms emerged in the late 1990s, but the real revolution began with the launch of Facebook in 2004. Today, billions of people use social media daily, sharing content, connecting with others, and consuming news and entertainment.
-            """
-        }
-    }
-    return passages.get(topic, {}).get(random.choice(list(passages[topic].keys())))
-
-def get_quiz_questions(language, reading_passage=None):
-    if language == "IELTS English" and reading_passage:
-        # Generate questions based on the reading passage using Gemini API
-        quiz_system = GeminiQuizSystem()
-        return quiz_system.generate_reading_questions(reading_passage)
-    
-    # Your existing questions dictionary for other types
-    questions = {
-        "IELTS English": [
-            {
-                "question": "Which word is a synonym for 'ubiquitous'?",
-                "options": ["rare", "widespread", "unique", "special"],
-                "correct": "widespread"
-            },
-            {
-                "question": "What is the correct past participle of 'write'?",
-                "options": ["wrote", "written", "writed", "writing"],
-                "correct": "written"
-            }
-        ],
-        "Professional English": [
-            {
-                "question": "Which is the most appropriate way to start a formal email?",
-                "options": ["Hey!", "Dear Sir/Madam,", "Hi there,", "Hello!"],
-                "correct": "Dear Sir/Madam,"
-            }
-        ],
-        "Urdu": [
-            {
-                "question": "What is the Urdu word for 'Hello'?",
-                "options": ["Khuda Hafiz", "Shukriya", "Assalam o Alaikum", "Namaste"],
-                "correct": "Assalam o Alaikum"
-            }
-        ]
-    }
-    return questions[language]
+from utils.services import (
+    get_content, get_data_manager, get_gamification, get_quiz_system, get_scheduler, get_selector
+)
+from utils.database import transaction
+from utils.motivation import show_motivation
+from utils.quiz_session import QuizSession
+from utils.session import require_login
+
+QUIZ_LENGTH = 5
+
+def get_ielts_reading_passage(topic, content=None):
+    content = content or get_content()
+    return content.random_passage("IELTS English", "Reading", topic)
+
+def preview_passage(topic):
+    """The passage shown for a topic, picked once until the next quiz starts."""
+    passages = st.session_state.setdefault('quiz_passages', {})
+    if topic not in passages:
+        passages[topic] = get_ielts_reading_passage(topic)
+    return passages[topic]
+
+def start_quiz(language, module, passage):
+    """Build the quiz session: passage, questions and answer key are fixed from here on."""
+    username = st.session_state.username
+    if passage:
+        # Reading questions are generated from the passage (cached per passage)
+        questions = get_quiz_system().generate_reading_questions(passage['text'])
+        return QuizSession(language, module, questions, passage)
+
+    selector = get_selector()
+    theta, attempts = selector.ability_state(username, language)
+    questions = selector.select(username, language, QUIZ_LENGTH, theta=theta)
+    return QuizSession(language, module, questions, theta=theta, ability_attempts=attempts)
+
+def save_quiz(quiz):
+    """Persist a finished quiz: progress, achievements, ability and review schedule.
+
+    Everything hangs off the progress row for the quiz's attempt id, so a
+    repeated save (another rerun, a retry after an error) writes nothing.
+    """
+    username = st.session_state.username
+    # Built before the transaction, so first-use migrations never see this attempt
+    data_manager, gamification = get_data_manager(), get_gamification()
+    selector, scheduler = get_selector(), get_scheduler()
+    with transaction(data_manager.progress.db_path):
+        if data_manager.save_progress(username, quiz.language, quiz.module, quiz.final_score,
+                                      quiz.finished_at, attempt_id=quiz.attempt_id):
+            selector.record_answers(username, quiz.language, quiz.bank_answers())
+            for question, (_, is_correct) in zip(quiz.questions, quiz.answers):
+                scheduler.record(username, quiz.language, question, is_correct, quiz.finished_at)
+            quiz.earned = gamification.record_quiz(username, quiz.final_score)
+    quiz.saved = True
+
+def show_passage(passage):
+    st.markdown("""
+        <div style='background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin: 20px 0;'>
+            <h3>Reading Passage</h3>
+            <h4>{}</h4>
+            <div style='height: 300px; overflow-y: auto;'>
+                {}
+            </div>
+        </div>
+    """.format(passage['title'], passage['text'].replace('\n', '<br>')), unsafe_allow_html=True)
 
-def main():
-    if 'logged_in' not in st.session_state or not st.session_state.logged_in:
-        st.error("Please log in first")
-        st.stop()
 
-    # Initialize systems
-    data_manager = DataManager()
-    gamification = GamificationSystem()
-    auth = Auth()
-    quiz_system = GeminiQuizSystem()
+def main():
+    require_login()
 
     st.title("Quiz")
 
-    # Language and topic selection
-    language = st.selectbox("Select Language", ["IELTS English", "Professional English", "Urdu"])
+    quiz = st.session_state.get('quiz')
+
+    # Language and topic selection (fixed while a quiz is running)
+    language = st.selectbox("Select Language", ["IELTS English", "Professional English", "Urdu"],
+                            disabled=quiz is not None)
 
     topics = {
         "IELTS English": {
@@ -102,147 +87,104 @@ def main():
     }
 
     # Handle nested topics for IELTS
+    passage = None
     if language == "IELTS English":
-        skill = st.selectbox("Select Skill", list(topics[language].keys()))
-        if skill == "Reading":
-            topic_type = st.selectbox("Select Type", topics[language][skill])
-            reading_passage = get_ielts_reading_passage(topic_type)
-        else:
-            topic_type = st.selectbox("Select Type", topics[language][skill])
+        skill = st.selectbox("Select Skill", list(topics[language].keys()), disabled=quiz is not None)
+        topic_type = st.selectbox("Select Type", topics[language][skill], disabled=quiz is not None)
+        if skill == "Reading" and quiz is None:
+            passage = preview_passage(topic_type)
     else:
-        skill = st.selectbox("Select Topic", topics[language])
-        reading_passage = None
-        topic_type = skill
-
-    # Initialize session state
-    if 'quiz_started' not in st.session_state:
-        st.session_state.quiz_started = False
-        st.session_state.questions = []
-        st.session_state.current_question = 0
-        st.session_state.score = 0
-        st.session_state.submitted = False
-        st.session_state.feedback = []
+        skill = st.selectbox("Select Topic", topics[language], disabled=quiz is not None)
 
     # Display reading passage for IELTS Reading
-    if language == "IELTS English" and skill == "Reading" and reading_passage:
-        st.markdown("""
-            <div style='background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin: 20px 0;'>
-                <h3>Reading Passage</h3>
-                <div style='height: 300px; overflow-y: auto;'>
-                    {}
-                </div>
-            </div>
-        """.format(reading_passage.replace('\n', '<br>')), unsafe_allow_html=True)
+    if quiz is not None:
+        passage = quiz.passage
+    if passage:
+        show_passage(passage)
 
     # Start Quiz button
-    if not st.session_state.quiz_started:
+    if quiz is None:
         if st.button("Start Quiz"):
             with st.spinner("Generating quiz questions..."):
-                if language == "IELTS English" and skill == "Reading":
-                    st.session_state.questions = get_quiz_questions(language, reading_passage)
-                else:
-                    st.session_state.questions = get_quiz_questions(language)
-                st.session_state.quiz_started = True
+                st.session_state.quiz = start_quiz(language, skill, passage)
                 st.rerun()
+        return
+
     # Quiz in progress
-    if st.session_state.quiz_started and not st.session_state.submitted:
+    if not quiz.finished:
         try:
-            question_data = st.session_state.questions[st.session_state.current_question]
+            if quiz.answers:
+                st.caption("Previous answer: " + ("correct!" if quiz.answers[-1][1] else "incorrect."))
+
+            question_data = quiz.question
 
             # Display progress
-            progress = (st.session_state.current_question + 1) / len(st.session_state.questions)
-            st.progress(progress)
+            st.progress((quiz.position + 1) / len(quiz.questions))
 
             # Display question
-            st.write(f"Question {st.session_state.current_question + 1}/{len(st.session_state.questions)}:")
+            st.write(f"Question {quiz.position + 1}/{len(quiz.questions)}:")
             st.write(question_data["question"])
 
             # Create unique key for radio button
-            radio_key = f"answer_{st.session_state.current_question}"
+            radio_key = f"answer_{quiz.position}"
             answer = st.radio("Select your answer:", question_data["options"], key=radio_key)
 
-            # Submit button
-            if st.button("Submit Answer", key=f"submit_{st.session_state.current_question}"):
-                # Get evaluation from Gemini
-                evaluation = quiz_system.evaluate_answer(
-                    question_data["question"],
-                    answer,
-                    question_data["correct"]
-                )
-
-                # Store feedback
-                st.session_state.feedback.append(evaluation)
-
-                # Update score
-                if evaluation["is_correct"]:
-                    st.success(evaluation["feedback"])
-                    st.session_state.score += evaluation["score"]
-                else:
-                    st.error(evaluation["feedback"])
-                    st.info(f"Improvement tip: {evaluation['improvement_tips']}")
-
-                # Move to next question or finish quiz
-                if st.session_state.current_question < len(st.session_state.questions) - 1:
-                    st.session_state.current_question += 1
-                    st.rerun()
-                else:
-                    st.session_state.submitted = True
-                    st.rerun()
+            # Submit button: grading and re-ranking happen in memory, and the
+            # explanation is fetched in the background while the quiz goes on
+            if st.button("Submit Answer", key=f"submit_{quiz.position}"):
+                quiz.feedback.append(get_quiz_system().evaluate_answer(
+                    question_data["question"], answer, question_data["correct"]
+                ))
+                quiz.submit(answer, get_selector() if quiz.adaptive else None, st.session_state.username)
+                st.rerun()
 
         except Exception as e:
             st.error(f"An error occurred: {str(e)}")
             if st.button("Reset Quiz"):
-                st.session_state.quiz_started = False
+                del st.session_state.quiz
                 st.rerun()
+        return
 
     # Quiz completed
-    if st.session_state.submitted:
-        final_score = (st.session_state.score / len(st.session_state.questions)) * 100
-
-        # Show motivation
-        show_motivation(final_score)
-
-        # Save progress
-        data_manager.save_progress(
-            st.session_state.username,
-            language,
-            topic,
-            final_score
-        )
-
-        # Check achievements
-        user_data = auth.get_user_data(st.session_state.username)
-        earned_achievements = gamification.check_achievements(
-            st.session_state.username,
-            final_score,
-            user_data
-        )
-
-        if earned_achievements:
-            for achievement in earned_achievements:
-                st.balloons()
-                st.success(f"New Achievement: {gamification.achievements[achievement]['name']}!")
-
-        st.write(f"Final Score: {final_score:.1f}%")
-
-        # Review answers
-        if st.button("Review Answers"):
-            for i, (question, feedback) in enumerate(zip(st.session_state.questions, st.session_state.feedback)):
-                with st.expander(f"Question {i+1}"):
-                    st.write(question["question"])
-                    st.write(f"Your answer was {'correct' if feedback['is_correct'] else 'incorrect'}")
-                    st.write(f"Feedback: {feedback['feedback']}")
-                    if not feedback['is_correct']:
-                        st.write(f"Tip: {feedback['improvement_tips']}")
-
-        if st.button("Try Another Quiz"):
-            st.session_state.quiz_started = False
-            st.session_state.questions = []
-            st.session_state.current_question = 0
-            st.session_state.score = 0
-            st.session_state.submitted = False
-            st.session_state.feedback = []
-            st.rerun()
+    first_view = not quiz.saved
+    if first_view:
+        save_quiz(quiz)
+
+    # Show motivation
+    show_motivation(quiz.final_score)
+
+    if first_view:
+        for achievement in quiz.earned:
+            st.balloons()
+            st.success(f"New Achievement: {get_gamification().achievements[achievement]['name']}!")
+
+    st.write(f"Final Score: {quiz.final_score:.1f}%")
+    st.caption(f"Completed in {int(quiz.duration.total_seconds()) // 60}m "
+               f"{int(quiz.duration.total_seconds()) % 60}s")
+
+    # Review answers
+    if st.button("Review Answers"):
+        quiz.feedback = [get_quiz_system().refresh_feedback(feedback) for feedback in quiz.feedback]
+        for i, (question, feedback) in enumerate(zip(quiz.questions, quiz.feedback)):
+            with st.expander(f"Question {i+1}"):
+                st.write(question["question"])
+                st.write(f"Your answer was {'correct' if feedback['is_correct'] else 'incorrect'}")
+                st.write(f"Feedback: {feedback['feedback']}")
+                if not feedback['is_correct']:
+                    st.write(f"Tip: {feedback['improvement_tips']}")
+                if feedback.get('feedback_pending'):
+                    st.caption("A detailed explanation is still being prepared.")
+
+    due = get_scheduler().due(st.session_state.username)
+    if due:
+        st.info(f"You have {len(due)} question(s) due for review.")
+        if st.button("Start Review"):
+            st.switch_page("pages/review.py")
+
+    if st.button("Try Another Quiz"):
+        del st.session_state.quiz
+        st.session_state.pop('quiz_passages', None)
+        st.rerun()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,55 @@
+import streamlit as st
+from utils.services import get_quiz_system, get_scheduler
+from utils.session import require_login
+
+REVIEW_BATCH = 20
+
+def show_last_result():
+    """Verdict and explanation for the previous answer, kept until the next one.
+
+    The explanation is fetched in the background, so it is picked up on
+    whichever rerun finds it ready.
+    """
+    result = st.session_state.get('review_result')
+    if result is None:
+        return
+    result = st.session_state.review_result = get_quiz_system().refresh_feedback(result)
+    if result['is_correct']:
+        st.success(result['feedback'])
+    else:
+        st.error(result['feedback'])
+        st.info(f"The correct answer was: {result['correct']}")
+        st.write(f"Tip: {result['improvement_tips']}")
+    if result.get('feedback_pending'):
+        st.caption("A detailed explanation is still being prepared.")
+
+def main():
+    require_login()
+
+    st.title("Review")
+    st.write("Questions you answered before come back here when they are due.")
+
+    scheduler = get_scheduler()
+    show_last_result()
+
+    due = scheduler.due(st.session_state.username, limit=REVIEW_BATCH)
+    if not due:
+        st.info("Nothing is due for review right now. Take a quiz to add questions!")
+        if st.button("Take a Quiz"):
+            st.switch_page("pages/quiz.py")
+        return
+
+    st.caption(f"{len(due)}{'+' if len(due) == REVIEW_BATCH else ''} question(s) due")
+    question = due[0]
+    st.write(f"**{question['language']}**")
+    st.write(question["question"])
+    answer = st.radio("Select your answer:", question["options"], key=f"review_{question['question']}")
+
+    if st.button("Check Answer"):
+        evaluation = get_quiz_system().evaluate_answer(question["question"], answer, question["correct"])
+        scheduler.record(st.session_state.username, question['language'], question, evaluation["is_correct"])
+        st.session_state.review_result = dict(evaluation, correct=question["correct"])
+        st.rerun()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import streamlit as st
-from utils.virtual_economy import VirtualEconomy
-from utils.auth import Auth
+from utils.services import get_auth, get_data_manager, get_economy
+from utils.user_context import UserContext
+from utils.session import require_login
 
 def format_item_card(item_id, item_data, user_coins):
     can_afford = user_coins >= item_data['price']
@@ -15,36 +16,36 @@ def format_item_card(item_id, item_data, user_coins):
     """
 
 def main():
-    if 'logged_in' not in st.session_state or not st.session_state.logged_in:
-        st.error("Please log in first")
-        st.stop()
+    require_login()
 
     st.title("Virtual Shop")
     
-    economy = VirtualEconomy()
-    auth = Auth()
+    economy = get_economy()
+    auth = get_auth()
+    context = UserContext(st.session_state.username, auth, get_data_manager(), st.session_state)
     
     # Get user data
-    user_data = auth.get_user_data(st.session_state.username)
+    user_data = context.user
     if not user_data:
         st.error("Could not load user data")
         st.stop()
     
+    # Check daily streak (may credit a bonus, so it runs before the wallet)
+    streak = context.check_daily_streak(economy)
+    
     # Show user's coins
     st.sidebar.title("Your Wallet")
-    st.sidebar.metric("Coins", user_data['coins'])
+    st.sidebar.metric("Coins", user_data.coins)
     
-    # Check daily streak
-    streak = economy.check_daily_streak(st.session_state.username)
     if streak > 0:
         st.sidebar.success(f"🔥 {streak} Day Streak!")
     
     # Show inventory
     st.sidebar.title("Your Inventory")
-    inventory = economy.get_user_inventory(st.session_state.username)
+    inventory = context.inventory
     if inventory:
         for item in inventory:
-            st.sidebar.markdown(f"- {item['item_id']} ({item['type']})")
+            st.sidebar.markdown(f"- {item.item_id} ({item.item_type})")
     else:
         st.sidebar.info("Your inventory is empty")
     
@@ -59,14 +60,17 @@ def main():
             cols = st.columns(2)
             for idx, (item_id, item_data) in enumerate(items.items()):
                 with cols[idx % 2]:
-                    st.markdown(format_item_card(item_id, item_data, user_data['coins']), unsafe_allow_html=True)
+                    st.markdown(format_item_card(item_id, item_data, user_data.coins), unsafe_allow_html=True)
                     if st.button(f"Purchase {item_data['name']}", key=item_id):
                         success, message = economy.purchase_item(st.session_state.username, item_id)
                         if success:
+                            context.invalidate()
                             st.success(message)
                             st.rerun()
                         else:
                             st.error(message)
 
+    st.session_state.backend_reads = context.reads
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,28 @@
+"""Fill the reading question cache ahead of time.
+
+Usage: python pregenerate_questions.py [--sets N]
+
+Every IELTS reading passage in the content packs gets up to N cached question sets, so "Start
+Quiz" is served from data/question_cache.json instead of waiting on Gemini.
+"""
+import argparse
+from utils.content_repository import ContentRepository
+from utils.gemini_helper import GeminiQuizSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sets', type=int, default=3, help="question sets to keep per passage")
+    args = parser.parse_args()
+
+    passages = [
+        passage['text']
+        for passage in ContentRepository().passages("IELTS English", "Reading")
+    ]
+    quiz_system = GeminiQuizSystem()
+    generated = quiz_system.pregenerate_reading_questions(passages, args.sets)
+    print(f"Generated {generated} question sets for {len(passages)} passages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Cheap password hashes; must be set before utils.passwords is imported
+os.environ.setdefault('UIE_PASSWORD_ITERATIONS', '1000')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.database import close_connections
+from utils.user_model import UserRecord
+from utils.user_repository import UserRepository
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run the test from an empty directory, so every store starts fresh."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data').mkdir()
+    yield tmp_path
+    close_connections()
+
+
+@pytest.fixture
+def users(data_dir):
+    return UserRepository()
+
+
+@pytest.fixture
+def make_user(users):
+    def make(username, **fields):
+        users.create_user(UserRecord(username=username, password='secret', **fields))
+        return users.get_user(username)
+    return make
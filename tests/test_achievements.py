@@ -0,0 +1,63 @@
+import pytest
+
+from utils.achievements import (
+    AchievementEngine, PURCHASE_MADE, QUIZ_COMPLETED, RULES, Rule, STREAK_UPDATED
+)
+from utils.ledger import ACHIEVEMENT_AWARD, CoinLedger
+
+
+@pytest.fixture
+def engine(users):
+    return AchievementEngine(users, CoinLedger())
+
+
+def test_rules_are_indexed_by_event(engine):
+    assert {event: [rule.achievement for rule in rules]
+            for event, rules in engine.rules_by_event.items()} == {
+        QUIZ_COMPLETED: ['first_quiz', 'perfect_score', 'quiz_10'],
+        STREAK_UPDATED: ['streak_3', 'streak_7'],
+        PURCHASE_MADE: ['first_purchase'],
+    }
+
+
+def test_rule_without_a_bit_is_refused(users):
+    with pytest.raises(ValueError):
+        AchievementEngine(users, CoinLedger(), rules=[*RULES, Rule('unknown', 'Unknown', 1, QUIZ_COMPLETED, 'quizzes', 1)])
+
+
+def test_award_sets_the_bit_and_credits_once(engine, make_user, users):
+    make_user('ann')
+    assert engine.handle('ann', QUIZ_COMPLETED, score=100) == ['first_quiz', 'perfect_score']
+    assert engine.handle('ann', QUIZ_COMPLETED, score=100) == []
+
+    ann = users.get_user('ann')
+    assert ann.achievements == ['first_quiz', 'perfect_score']
+    assert ann.coins == 150
+    history = engine.ledger.history('ann')
+    assert sorted((entry['item_id'], entry['amount']) for entry in history) == [
+        ('first_quiz', 50), ('perfect_score', 100)
+    ]
+    assert {entry['transaction_type'] for entry in history} == {ACHIEVEMENT_AWARD}
+
+
+def test_counters_reach_thresholds(engine, make_user, users):
+    make_user('ann')
+    for _ in range(9):
+        assert 'quiz_10' not in engine.handle('ann', QUIZ_COMPLETED, score=50)
+    assert engine.handle('ann', QUIZ_COMPLETED, score=50) == ['quiz_10']
+    assert engine.handle('ann', STREAK_UPDATED, streak=3) == ['streak_3']
+    assert engine.handle('ann', STREAK_UPDATED, streak=2) == []
+
+
+def test_failed_award_leaves_no_coins_or_bits(engine, make_user, users, monkeypatch):
+    make_user('ann')
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(users, 'update_user', broken)
+    with pytest.raises(RuntimeError):
+        engine.award('ann', ['first_quiz'])
+    ann = users.get_user('ann')
+    assert (ann.coins, ann.achievement_bits) == (0, 0)
+    assert engine.ledger.history('ann') == []
@@ -0,0 +1,54 @@
+import pytest
+
+from utils.adaptive import AdaptiveSelector
+
+
+class Bank:
+    """Stands in for ContentRepository: one question per difficulty level."""
+
+    def __init__(self):
+        self.items = [
+            {'id': f'{level}-{n}', 'difficulty': level, 'question': '?', 'options': ['a'], 'correct': 'a'}
+            for level in ('easy', 'medium', 'hard') for n in range(3)
+        ]
+
+    def questions(self, language):
+        return self.items if language == 'Urdu' else []
+
+
+@pytest.fixture
+def selector(data_dir):
+    return AdaptiveSelector(Bank(), seed=1)
+
+
+def test_selection_matches_ability_and_respects_exclusions(selector):
+    assert {q['difficulty'] for q in selector.select('ann', 'Urdu', 3, theta=-3)} == {'easy'}
+    assert {q['difficulty'] for q in selector.select('ann', 'Urdu', 3, theta=3)} == {'hard'}
+
+    picked = selector.select('ann', 'Urdu', 9, exclude=['easy-0', 'hard-2'])
+    assert len(picked) == 7
+    assert not {'easy-0', 'hard-2'} & {q['id'] for q in picked}
+    assert selector.select('ann', 'Urdu', 5, exclude=[q['id'] for q in Bank().items]) == []
+    assert selector.select('ann', 'English', 5) == []
+
+
+def test_estimate_is_in_memory(selector):
+    theta = selector.estimate('Urdu', 0.0, 0, 'medium-0', True)
+    assert theta > 0
+    assert selector.estimate('Urdu', 0.0, 0, 'medium-0', False) < 0
+    assert selector.ability_state('ann', 'Urdu') == (0.0, 0)
+
+
+def test_answers_update_ability_and_items_online(selector):
+    selector.record_answers('ann', 'Urdu', [('medium-0', True), ('medium-1', True), ('unknown', True)])
+    theta, attempts = selector.ability_state('ann', 'Urdu')
+    assert theta > 0 and attempts == 2
+
+    pool = selector._pool('Urdu')
+    # Answered correctly, so the item looks easier than its prior
+    assert pool.difficulty[pool.index['medium-0']] < 0
+    # The change is stored, not just cached
+    assert AdaptiveSelector(Bank())._pool('Urdu').difficulty[pool.index['medium-0']] < 0
+
+    selector.record_answer('ann', 'Urdu', 'hard-0', False)
+    assert selector.ability('ann', 'Urdu') < theta
@@ -0,0 +1,83 @@
+import csv
+
+from utils.bulk_io import export_progress, export_users, import_progress, import_users
+from utils.data_manager import DataManager
+from utils.ledger import CoinLedger
+from utils.passwords import MIGRATION_ITERATIONS, verify_password
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def test_import_users_rejects_bad_and_duplicate_rows(users, data_dir):
+    path = write_csv(data_dir / 'users.csv', [
+        {'username': 'ann', 'password': 'pw1', 'coins': ''},
+        {'username': 'bob', 'password': 'pw2', 'coins': '40'},
+        {'username': 'ann', 'password': 'again', 'coins': ''},
+        {'username': '', 'password': 'pw', 'coins': ''},
+        {'username': 'cat', 'password': 'pw', 'coins': 'lots'},
+    ])
+    report = import_users(path, iterations=1000)
+    assert (report.imported, report.skipped) == (2, 3)
+    assert verify_password('pw1', users.get_user('ann').password)
+
+    ledger = CoinLedger()
+    assert ledger.balance('ann') == users.get_user('ann').coins == 100
+    assert ledger.balance('bob') == users.get_user('bob').coins == 40
+
+    # Importing the same file again only finds existing users
+    report = import_users(path, iterations=1000)
+    assert report.imported == 0
+    assert any("already exists" in error for error in report.errors)
+
+
+def test_export_and_import_round_trip(users, data_dir):
+    import_users(write_csv(data_dir / 'users.csv', [
+        {'username': 'ann', 'password': 'pw'}, {'username': 'bob', 'password': 'pw'}
+    ]), iterations=1000)
+    DataManager().save_progress('ann', 'Urdu', 'Basics', 80, attempt_id='a1')
+    report = import_progress(write_csv(data_dir / 'progress.csv', [
+        {'username': 'bob', 'language': 'Urdu', 'module': 'Basics', 'score': '70',
+         'created_at': '2024-01-02T03:04:05', 'attempt_id': 'b1'},
+        {'username': 'zed', 'language': 'Urdu', 'module': '', 'score': '70',
+         'created_at': '', 'attempt_id': ''},
+        {'username': 'bob', 'language': 'Urdu', 'module': '', 'score': '170',
+         'created_at': '', 'attempt_id': ''},
+    ]))
+    assert (report.imported, report.skipped) == (1, 2)
+
+    assert export_users(data_dir / 'users.xlsx') == 2
+    assert export_progress(data_dir / 'progress_export.csv') == 2
+    hashes = {user: users.get_user(user).password for user in ('ann', 'bob')}
+
+    # Re-importing the exports changes nothing: users exist, attempts are recorded
+    assert import_users(data_dir / 'users.xlsx').imported == 0
+    report = import_progress(data_dir / 'progress_export.csv')
+    assert (report.imported, report.skipped) == (0, 2)
+    assert {user: users.get_user(user).password for user in hashes} == hashes
+    assert len(DataManager().progress.get_user_rows('bob')) == 1
+
+
+def test_import_progress_writes_to_the_given_database(users, data_dir):
+    other = str(data_dir / 'other.db')
+    import_users(write_csv(data_dir / 'users.csv', [{'username': 'ann', 'password': 'pw'}]),
+                 iterations=1000, db_path=other)
+    report = import_progress(write_csv(data_dir / 'progress.csv', [
+        {'username': 'ann', 'language': 'Urdu', 'module': 'Basics', 'score': '100'},
+    ]), db_path=other)
+    assert report.imported == 1
+
+    assert len(DataManager(other).progress.get_user_rows('ann')) == 1
+    assert DataManager(other).get_leaderboard('Urdu').to_dict() == {'ann': 100.0}
+    assert CoinLedger(other).balance('ann') > 100  # First quiz achievement credited there
+    assert DataManager().progress.get_user_rows('ann') == []
+
+
+def test_imported_passwords_default_to_the_interim_cost(users, data_dir):
+    import_users(write_csv(data_dir / 'users.csv', [{'username': 'ann', 'password': 'pw'}]))
+    assert users.get_user('ann').password.split('$')[1] == str(MIGRATION_ITERATIONS)
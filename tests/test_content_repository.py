@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from utils.content_repository import ContentRepository, LESSON, PASSAGE
+
+
+def passage(id, topic, difficulty, title, text):
+    return {'id': id, 'language': 'IELTS English', 'skill': 'Reading', 'topic': topic,
+            'difficulty': difficulty, 'title': title, 'text': text}
+
+
+@pytest.fixture
+def content(data_dir):
+    pack_dir = data_dir / 'content'
+    pack_dir.mkdir()
+    (pack_dir / 'pack.json').write_text(json.dumps({
+        'passages': [
+            passage('p1', 'Academic', 'hard', 'Coral Reefs', 'Reefs bleach as oceans warm.'),
+            passage('p2', 'General', 'easy', 'Bus Timetables', 'The number 9 bus leaves hourly.'),
+        ],
+        'questions': [
+            {'id': 'q1', 'language': 'Urdu', 'skill': 'Grammar', 'difficulty': 'easy',
+             'question': 'Pick the verb', 'options': ['a', 'b'], 'correct': 'a'},
+        ],
+        'lessons': [
+            {'id': 'l1', 'language': 'Urdu', 'module': 'Basics', 'title': 'Basics', 'text': 'Alphabet'},
+        ],
+    }), encoding='utf-8')
+    return ContentRepository(pack_dir)
+
+
+def test_lookup_by_filters(content):
+    assert [p['id'] for p in content.passages('IELTS English')] == ['p1', 'p2']
+    assert [p['id'] for p in content.passages('IELTS English', 'Reading', 'General')] == ['p2']
+    assert [p['id'] for p in content.passages('IELTS English', difficulty='hard')] == ['p1']
+    assert content.passages('Urdu') == ()
+    assert content.random_passage('IELTS English', topic='Academic')['title'] == 'Coral Reefs'
+    assert content.random_passage('Urdu') is None
+    assert [q['id'] for q in content.questions('Urdu')] == ['q1']
+    assert content.lesson('Urdu', 'Basics')['text'] == 'Alphabet'
+    assert content.lesson('Urdu', 'Missing') is None
+
+
+def test_full_text_search(content):
+    assert [item['id'] for item in content.search('oceans')] == ['p1']
+    assert [item['id'] for item in content.search('bus', kind=PASSAGE)] == ['p2']
+    assert content.search('bus', kind=LESSON) == []
+    assert content.search('alphabet', language='Urdu')[0]['kind'] == LESSON
+    # Query syntax in user input is searched for literally, not parsed
+    assert content.search('reefs" OR "bus') == []
+    assert content.search('NEAR(') == []
+    assert content.search('   ') == []
+
+
+def test_reindex_only_when_packs_change(content, data_dir):
+    assert not content.reindex()
+    pack = data_dir / 'content' / 'pack.json'
+    data = json.loads(pack.read_text(encoding='utf-8'))
+    data['passages'].append(passage('p3', 'General', 'easy', 'Night Buses', 'Buses run all night.'))
+    pack.write_text(json.dumps(data), encoding='utf-8')
+
+    assert content.reindex()
+    assert [p['id'] for p in content.passages('IELTS English', topic='General')] == ['p2', 'p3']
@@ -0,0 +1,82 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from utils.database import DB_PATH, get_connection, run_once, transaction
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def count(table='t'):
+    return get_connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+@pytest.fixture
+def table(data_dir):
+    get_connection().execute("CREATE TABLE t (x INTEGER)")
+
+
+def test_nested_transaction_commits_with_the_outer_one(table):
+    conn = get_connection()
+    with transaction():
+        with transaction():
+            conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.in_transaction
+    assert not conn.in_transaction
+    assert count() == 1
+
+
+def test_error_in_nested_transaction_rolls_back_everything(table):
+    with pytest.raises(RuntimeError):
+        with transaction() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            with transaction():
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("boom")
+    assert count() == 0
+    # The depth was reset, so the next transaction starts cleanly
+    with transaction() as conn:
+        conn.execute("INSERT INTO t VALUES (3)")
+    assert count() == 1
+
+
+def test_run_once_applies_a_migration_once(table):
+    calls = []
+
+    def migration(conn):
+        calls.append(1)
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    assert run_once('add_row', migration)
+    assert not run_once('add_row', migration)
+    assert calls == [1]
+    assert count() == 1
+
+
+def test_failed_migration_is_not_recorded(table):
+    def broken(conn):
+        conn.execute("INSERT INTO t VALUES (1)")
+        raise ValueError("bad data")
+
+    with pytest.raises(ValueError):
+        run_once('broken', broken)
+    assert count() == 0
+    assert run_once('broken', lambda conn: None)
+
+
+def test_committed_writes_survive_a_crash(table):
+    """A process killed before closing its connection leaves its commits in the WAL."""
+    script = textwrap.dedent(f"""
+        import os, sys
+        sys.path.insert(0, {str(ROOT)!r})
+        from utils.database import transaction
+        with transaction() as conn:
+            conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(100)])
+        os._exit(0)
+    """)
+    subprocess.run([sys.executable, '-c', script], check=True)
+    assert count() == 100
+    assert get_connection(DB_PATH).execute("PRAGMA integrity_check").fetchone()[0] == 'ok'
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from utils import gemini_client
+from utils.gemini_client import GeminiClient, PoolExhausted, is_transient
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class StubModel:
+    """Replies with the prompt after `delay` seconds, after raising `errors` in turn."""
+
+    def __init__(self, delay=0.0, errors=()):
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+            error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+        if prompt.startswith('fail'):
+            raise ValueError(prompt)
+        time.sleep(self.delay)
+        return Response(prompt)
+
+
+@pytest.fixture(autouse=True)
+def idle_pool():
+    """Let calls hung by an earlier test drain before the next one starts."""
+    deadline = time.monotonic() + 5
+    while gemini_client.hung_calls() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    yield
+
+
+def test_transient_errors():
+    assert is_transient(TimeoutError())
+    assert is_transient(ConnectionError())
+    for code in (429, 500, 503):
+        assert is_transient(ApiError(code))
+    for code in (400, 403, 404):
+        assert not is_transient(ApiError(code))
+    assert not is_transient(ValueError("bad prompt"))
+    assert is_transient(type('ServiceUnavailable', (Exception,), {})())
+
+
+def test_transient_errors_are_retried():
+    model = StubModel(errors=[ApiError(503), ApiError(429)])
+    client = GeminiClient(model, max_retries=2, backoff=0.001)
+    assert client.generate('hello') == 'hello'
+    assert model.calls == 3
+
+
+def test_other_errors_are_raised_at_once():
+    model = StubModel(errors=[ApiError(400)])
+    client = GeminiClient(model, max_retries=2, backoff=0.001)
+    with pytest.raises(ApiError):
+        client.generate('hello')
+    assert model.calls == 1
+
+
+def test_retries_give_up_after_max_retries():
+    model = StubModel(errors=[ApiError(500)] * 5)
+    client = GeminiClient(model, max_retries=2, backoff=0.001)
+    with pytest.raises(ApiError):
+        client.generate('hello')
+    assert model.calls == 3
+
+
+def test_deadline_counts_from_when_the_call_starts():
+    """Eight 0.3s calls through four workers: the second wave queues for 0.3s,
+    which must not count against its 0.5s deadline."""
+    client = GeminiClient(StubModel(delay=0.3), timeout=0.5, max_retries=0)
+    prompts = [str(i) for i in range(2 * gemini_client.MAX_CONCURRENCY)]
+    assert client.generate_many(prompts) == prompts
+
+
+def test_slow_call_times_out():
+    client = GeminiClient(StubModel(delay=0.5), timeout=0.05, max_retries=0)
+    with pytest.raises(TimeoutError):
+        client.generate('slow')
+
+
+def test_hung_calls_exhaust_the_pool():
+    model = StubModel(delay=1.0)
+    client = GeminiClient(model, timeout=0.05, max_retries=5, backoff=0.001)
+    results = client.generate_many(['hang'] * (gemini_client.MAX_CONCURRENCY + 2))
+
+    assert model.calls == gemini_client.MAX_CONCURRENCY  # No retries once the pool is full
+    assert all(isinstance(result, (TimeoutError, PoolExhausted)) for result in results)
+    assert gemini_client.pool_exhausted()
+    with pytest.raises(PoolExhausted):
+        client.generate('next')
+
+    time.sleep(1.2)
+    assert gemini_client.hung_calls() == 0
+    assert GeminiClient(StubModel()).generate('recovered') == 'recovered'
+
+
+def test_generate_many_keeps_failures_in_place():
+    client = GeminiClient(StubModel(), max_retries=0)
+    results = client.generate_many(['one', 'fail two', 'three'])
+    assert results[0] == 'one' and results[2] == 'three'
+    assert isinstance(results[1], ValueError)
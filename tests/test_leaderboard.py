@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from utils.data_manager import DataManager
+from utils.leaderboard import Leaderboard, period_key
+
+
+def test_period_keys():
+    when = datetime(2024, 3, 5)
+    assert period_key('all', when) == 'all'
+    assert period_key('week', when) == 'week:2024-W10'
+    assert period_key('month', when) == 'month:2024-03'
+
+
+def test_attempts_land_in_their_week_and_month(data_dir):
+    board = Leaderboard()
+    now = datetime.now()
+    board.record('ann', 'Urdu', 90, now)
+    board.record('ann', 'Urdu', 70, now)
+    board.record('bob', 'Urdu', 60, now - timedelta(days=62))
+
+    assert board.top('Urdu') == [('ann', 80.0), ('bob', 60.0)]
+    assert board.top('Urdu', 'week') == [('ann', 80.0)]
+    assert board.top('Urdu', 'month') == [('ann', 80.0)]
+    # Every attempt also counts towards the all-languages board
+    assert board.top(None) == [('ann', 80.0), ('bob', 60.0)]
+    assert board.top('IELTS English') == []
+
+
+def test_legacy_rows_only_count_all_time(data_dir):
+    pd.DataFrame([
+        {'username': 'ann', 'language': 'Urdu', 'module': 'Basics', 'score': 100, 'completed': True},
+        {'username': 'bob', 'language': 'Urdu', 'module': 'Basics', 'score': 40, 'completed': True},
+    ]).to_excel(data_dir / 'data' / 'progress.xlsx', index=False)
+
+    data_manager = DataManager()
+    assert data_manager.progress.get_user_rows('ann')[0]['created_at'] is None
+    data_manager.save_progress('bob', 'Urdu', 'Basics', 80)
+
+    board = data_manager.leaderboard
+    assert board.top('Urdu') == [('ann', 100.0), ('bob', 60.0)]
+    assert board.top('Urdu', 'week') == [('bob', 80.0)]
+    assert board.top('Urdu', 'month') == [('bob', 80.0)]
@@ -0,0 +1,56 @@
+import pytest
+
+from utils.database import get_connection
+from utils.ledger import CoinLedger, InsufficientFunds, OPENING_BALANCE, PURCHASE, SIGNUP_BONUS
+
+
+def stored_coins(username):
+    return get_connection().execute(
+        "SELECT coins FROM users WHERE username = ?", (username,)
+    ).fetchone()[0]
+
+
+def test_opening_balance_matches_existing_coins(make_user):
+    make_user('ann', coins=250)
+    ledger = CoinLedger()
+    assert ledger.balance('ann') == 250
+    assert ledger.history('ann')[0]['transaction_type'] == OPENING_BALANCE
+
+
+def test_credits_and_debits_keep_the_balance_in_step(make_user):
+    ledger = CoinLedger()
+    make_user('ann')
+    assert ledger.credit('ann', 100, SIGNUP_BONUS) == 100
+    assert ledger.debit('ann', 30, PURCHASE, 'extra_hints') == 70
+    assert ledger.balance('ann') == stored_coins('ann') == 70
+
+
+def test_overdraft_changes_nothing(make_user):
+    ledger = CoinLedger()
+    make_user('ann')
+    ledger.credit('ann', 10, SIGNUP_BONUS)
+    version = get_connection().execute("SELECT version FROM users").fetchone()[0]
+
+    with pytest.raises(InsufficientFunds):
+        ledger.debit('ann', 11, PURCHASE)
+    assert ledger.balance('ann') == stored_coins('ann') == 10
+    assert get_connection().execute("SELECT version FROM users").fetchone()[0] == version
+
+
+def test_unknown_user_raises_key_error(users):
+    with pytest.raises(KeyError):
+        CoinLedger().credit('nobody', 10, SIGNUP_BONUS)
+
+
+def test_purchase_debits_through_the_ledger(data_dir):
+    from utils.auth import Auth
+    from utils.virtual_economy import VirtualEconomy
+
+    Auth().signup('ann', 'pw')  # 100 coin welcome bonus
+    economy = VirtualEconomy()
+    economy.ledger.credit('ann', 100, SIGNUP_BONUS)
+    assert economy.purchase_item('ann', 'extra_hints')[0]
+    assert economy.purchase_item('ann', 'premium_theme') == (False, "Not enough coins")
+    # 200 - 150, plus 25 for the first purchase achievement
+    assert economy.get_balance('ann') == stored_coins('ann') == 75
+    assert [item.item_id for item in economy.get_user_inventory('ann')] == ['extra_hints']
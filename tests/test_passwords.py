@@ -0,0 +1,77 @@
+import pandas as pd
+
+from utils.auth import Auth
+from utils.database import get_connection, transaction
+from utils.passwords import (
+    MIGRATION_ITERATIONS, hash_password, hash_plaintext_rows, is_hashed, needs_rehash,
+    verify_password
+)
+from utils.user_repository import UserRepository
+
+
+def stored_password(username):
+    return get_connection().execute(
+        "SELECT password FROM users WHERE username = ?", (username,)
+    ).fetchone()[0]
+
+
+def test_hash_verifies_only_the_right_password():
+    stored = hash_password('correct horse', 1000)
+    assert is_hashed(stored)
+    assert verify_password('correct horse', stored)
+    assert not verify_password('wrong horse', stored)
+    # Salted: the same password never hashes the same way twice
+    assert hash_password('correct horse', 1000) != stored
+
+
+def test_needs_rehash():
+    assert needs_rehash('plaintext', 1000)
+    assert needs_rehash(hash_password('pw', 1000), 2000)
+    assert not needs_rehash(hash_password('pw', 1000), 1000)
+
+
+def test_plaintext_rows_are_hashed_once(make_user):
+    make_user('ann')
+    # Looks like the prefix with a '-' where '_' belongs, so it is still plaintext
+    make_user('bob')
+    with transaction() as conn:
+        conn.execute("UPDATE users SET password = 'pbkdf2-sha256$abc' WHERE username = 'bob'")
+    make_user('cat')
+    with transaction() as conn:
+        conn.execute("UPDATE users SET password = ? WHERE username = 'cat'", (hash_password('pw', 1000),))
+    cat_hash = stored_password('cat')
+
+    with transaction() as conn:
+        assert hash_plaintext_rows(conn, 1000) == 2
+    assert verify_password('secret', stored_password('ann'))
+    assert verify_password('pbkdf2-sha256$abc', stored_password('bob'))
+    assert stored_password('cat') == cat_hash
+
+    with transaction() as conn:
+        assert hash_plaintext_rows(conn, 1000) == 0
+
+
+def test_login_upgrades_plaintext_and_old_work_factors(make_user):
+    make_user('ann')
+    auth = Auth(password_iterations=2000)
+    assert not auth.login('ann', 'wrong')[0]
+    assert stored_password('ann') == 'secret'
+
+    assert auth.login('ann', 'secret')[0]
+    assert not needs_rehash(stored_password('ann'), 2000)
+
+    auth = Auth(password_iterations=3000)
+    assert auth.login('ann', 'secret')[0]
+    assert not needs_rehash(stored_password('ann'), 3000)
+
+
+def test_legacy_import_hashes_at_the_interim_cost(data_dir):
+    pd.DataFrame([{'username': 'ann', 'password': 'secret'}]).to_excel(
+        data_dir / 'data' / 'users.xlsx', index=False
+    )
+    UserRepository()
+    assert stored_password('ann').split('$')[1] == str(MIGRATION_ITERATIONS)
+
+    auth = Auth(password_iterations=MIGRATION_ITERATIONS + 1000)
+    assert auth.login('ann', 'secret')[0]
+    assert not needs_rehash(stored_password('ann'), MIGRATION_ITERATIONS + 1000)
@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+
+import pytest
+
+from utils import gemini_helper, llm_cache
+from utils.gemini_helper import GeminiQuizSystem
+from utils.llm_cache import LLMCache
+
+QUESTIONS = [{'question': 'What is it about?', 'options': ['a', 'b', 'c', 'd'], 'correct': 'a'}]
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Counts calls and answers every prompt with a fixed question set."""
+
+    def __init__(self, questions=QUESTIONS):
+        self.questions = questions
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+        return Response(json.dumps(self.questions))
+
+
+@pytest.fixture
+def cache_path(data_dir):
+    return str(data_dir / 'data' / 'question_cache.json')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: now[0])
+    return now
+
+
+def quiz_system(model, cache_path, **cache_options):
+    return GeminiQuizSystem(
+        model=model,
+        question_cache=LLMCache(cache_path, **cache_options),
+        feedback_cache=LLMCache(cache_path + '.feedback', pool_size=1)
+    )
+
+
+def test_cache_hit_skips_the_model(cache_path):
+    model = StubModel()
+    system = quiz_system(model, cache_path)
+    assert system.generate_reading_questions("A passage.") == QUESTIONS
+    assert system.generate_reading_questions("A passage.") == QUESTIONS
+    assert model.calls == 1
+
+    system.generate_reading_questions("Another passage.")
+    assert model.calls == 2
+
+
+def test_prompt_version_bump_misses_the_cache(cache_path, monkeypatch):
+    model = StubModel()
+    system = quiz_system(model, cache_path)
+    system.generate_reading_questions("A passage.")
+    monkeypatch.setattr(gemini_helper, 'READING_PROMPT_VERSION', gemini_helper.READING_PROMPT_VERSION + 1)
+    system.generate_reading_questions("A passage.")
+    assert model.calls == 2
+
+
+def test_entries_expire(cache_path, clock):
+    cache = LLMCache(cache_path, ttl_seconds=60)
+    cache.put('key', 'value')
+    clock[0] += 59
+    assert cache.get('key') == 'value'
+    clock[0] += 2
+    assert cache.get('key') is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_keys_are_evicted(cache_path, clock):
+    cache = LLMCache(cache_path, max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+
+
+def test_pool_keeps_the_newest_values(cache_path):
+    cache = LLMCache(cache_path, pool_size=2)
+    for value in (1, 2, 3):
+        cache.put('key', value)
+    assert cache.get_pool('key') == [2, 3]
+
+
+def test_cache_survives_a_reload(cache_path, clock):
+    cache = LLMCache(cache_path, ttl_seconds=60)
+    cache.put('key', {'answer': 42})
+    assert LLMCache(cache_path, ttl_seconds=60).get('key') == {'answer': 42}
+    clock[0] += 61
+    assert len(LLMCache(cache_path, ttl_seconds=60)) == 0
+
+
+def test_unreadable_cache_file_is_ignored(cache_path):
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        f.write('{not json')
+    assert len(LLMCache(cache_path)) == 0
+
+
+def test_pregeneration_fills_each_pool_up_to_its_size(cache_path):
+    model = StubModel()
+    system = quiz_system(model, cache_path, pool_size=2)
+    system.generate_reading_questions("First.")
+
+    assert system.pregenerate_reading_questions(["First.", "Second."], sets_per_passage=3) == 3
+    assert model.calls == 4
+    for passage in ("First.", "Second."):
+        assert len(system.question_cache.get_pool(system._reading_cache_key(passage))) == 2
+    # Pools already full: nothing to request
+    assert system.pregenerate_reading_questions(["First.", "Second."]) == 0
+    assert model.calls == 4
+
+
+class FlakyFeedbackModel:
+    """Fails the first request, then explains every answer."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.calls == 1:
+            raise ValueError("malformed response")
+        return Response(json.dumps({'feedback': 'Because.', 'improvement_tips': 'Read again.'}))
+
+
+def wait_until_settled(key):
+    deadline = time.monotonic() + 5
+    while key in gemini_helper._pending_feedback and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert key not in gemini_helper._pending_feedback
+
+
+def test_failed_background_feedback_is_retried(cache_path):
+    model = FlakyFeedbackModel()
+    system = quiz_system(model, cache_path)
+    evaluation = system.evaluate_answer('Why?', 'b', 'a')
+    assert evaluation['feedback_pending']
+    wait_until_settled(evaluation['feedback_key'])
+    assert system.refresh_feedback(evaluation)['feedback'] == "Your answer is incorrect."
+
+    evaluation = system.evaluate_answer('Why?', 'b', 'a')
+    wait_until_settled(evaluation['feedback_key'])
+    assert model.calls == 2
+    assert system.refresh_feedback(evaluation)['feedback'] == 'Because.'
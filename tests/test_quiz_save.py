@@ -0,0 +1,64 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+import streamlit as st
+
+from pages import quiz as quiz_page
+from utils.auth import Auth
+from utils.database import get_connection
+from utils.quiz_session import QuizSession
+
+QUESTIONS = [
+    {'question': 'One?', 'options': ['1', '2'], 'correct': '1'},
+    {'question': 'Two?', 'options': ['1', '2'], 'correct': '2'},
+]
+
+
+@pytest.fixture
+def services(data_dir, monkeypatch):
+    """Fresh process-wide services for the test's data directory."""
+    st.cache_resource.clear()
+    monkeypatch.setattr(quiz_page, 'st', SimpleNamespace(session_state=SimpleNamespace(username='ann')))
+    Auth().signup('ann', 'pw')
+    yield
+    st.cache_resource.clear()
+
+
+def snapshot():
+    conn = get_connection()
+    return {
+        table: [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2, 3")]
+        for table in ('progress', 'leaderboard_stats', 'progress_stats', 'progress_recent',
+                      'transactions', 'achievement_counters', 'review_items', 'users')
+    }
+
+
+def finished_quiz():
+    quiz = QuizSession('Urdu', 'Basics', list(QUESTIONS))
+    quiz.submit('1')
+    quiz.submit('2')
+    assert quiz.finished
+    return quiz
+
+
+def test_saving_an_attempt_twice_writes_it_once(services):
+    quiz = finished_quiz()
+    quiz_page.save_quiz(quiz)
+    assert quiz.saved and quiz.earned == ['first_quiz', 'perfect_score']
+    saved = snapshot()
+    assert len(saved['progress']) == 1
+
+    # A rerun or a retry with the same attempt id
+    quiz_page.save_quiz(quiz)
+    copy = finished_quiz()
+    copy.attempt_id, copy.finished_at = quiz.attempt_id, datetime.now()
+    quiz_page.save_quiz(copy)
+    assert copy.earned == []
+    assert snapshot() == saved
+
+
+def test_a_new_attempt_is_saved(services):
+    quiz_page.save_quiz(finished_quiz())
+    quiz_page.save_quiz(finished_quiz())
+    assert len(snapshot()['progress']) == 2
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.review_scheduler import (
+    DEFAULT_EASE, MIN_EASE, RELEARN_DELAY, ReviewQueue, ReviewScheduler, due_time, item_id_for, sm2
+)
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def test_sm2_steps():
+    ease, interval, repetitions = sm2(DEFAULT_EASE, 0.0, 0, 4)
+    assert (interval, repetitions) == (1.0, 1)
+    ease, interval, repetitions = sm2(ease, interval, repetitions, 4)
+    assert (interval, repetitions) == (6.0, 2)
+    ease, interval, repetitions = sm2(ease, interval, repetitions, 4)
+    assert interval == pytest.approx(6.0 * ease)
+    assert ease == pytest.approx(DEFAULT_EASE)  # Quality 4 keeps the ease
+
+    # A lapse restarts the item and makes it harder, down to the floor
+    assert sm2(ease, interval, repetitions, 1) == (pytest.approx(ease - 0.2), 0.0, 0)
+    assert sm2(MIN_EASE, 6.0, 2, 1)[0] == MIN_EASE
+    assert sm2(DEFAULT_EASE, 0.0, 0, 5)[0] > DEFAULT_EASE
+
+
+def test_due_time():
+    assert due_time(NOW, 0) == NOW + RELEARN_DELAY
+    assert due_time(NOW, 6.0) == NOW + timedelta(days=6)
+
+
+def test_queue_serves_soonest_first_and_skips_stale_entries():
+    queue = ReviewQueue([
+        {'item_id': 'b', 'due_at': '2024-01-02'},
+        {'item_id': 'a', 'due_at': '2024-01-01'},
+        {'item_id': 'c', 'due_at': '2024-01-03'},
+    ])
+    assert queue.peek_due('2024-01-05', 10) == ['a', 'b', 'c']
+    assert queue.peek_due('2024-01-02', 10) == ['a', 'b']
+    assert queue.peek_due('2024-01-05', 2) == ['a', 'b']
+
+    queue.push('a', '2024-01-04')  # Rescheduled: its old entry is now stale
+    queue.push('c', '2024-01-03')  # Unchanged: no duplicate entry
+    assert queue.peek_due('2024-01-05', 10) == ['b', 'c', 'a']
+    assert queue.peek_due('2024-01-01', 10) == []
+
+
+def test_scheduler_brings_back_wrong_answers_first(data_dir):
+    scheduler = ReviewScheduler()
+    right = {'question': 'Two?', 'options': ['1', '2'], 'correct': '2'}
+    wrong = {'id': 'bank-1', 'question': 'One?', 'options': ['1', '2'], 'correct': '1'}
+    scheduler.record('ann', 'Urdu', right, True, NOW)
+    scheduler.record('ann', 'Urdu', wrong, False, NOW)
+
+    assert scheduler.due('ann', now=NOW) == []
+    due = scheduler.due('ann', now=NOW + timedelta(hours=1))
+    assert [item_id_for(q) for q in due] == ['bank-1']
+    assert due[0]['language'] == 'Urdu'
+    later = scheduler.due('ann', now=NOW + timedelta(days=2))
+    assert [q['question'] for q in later] == ['One?', 'Two?']
+
+    # A fresh scheduler rebuilds the same queue from the table
+    assert ReviewScheduler().due('ann', now=NOW + timedelta(days=2)) == later
+    assert scheduler.due('bob', now=NOW + timedelta(days=2)) == []
@@ -0,0 +1,51 @@
+import time
+
+from utils.auth import Auth
+from utils.ledger import SIGNUP_BONUS
+from utils.session_tokens import SessionTokens
+from utils.user_model import UserRecord
+
+USER = UserRecord(username='ann', password='x', level=2, version=7)
+
+
+def test_round_trip():
+    tokens = SessionTokens('secret')
+    snapshot = tokens.verify(tokens.issue(USER))
+    assert (snapshot['username'], snapshot['level'], snapshot['version']) == ('ann', 2, 7)
+
+
+def test_forged_and_malformed_tokens_are_rejected():
+    tokens = SessionTokens('secret')
+    token = tokens.issue(USER)
+    payload, signature = token.split('.')
+
+    assert SessionTokens('other secret').verify(token) is None
+    assert tokens.verify(payload[:-2] + 'xx.' + signature) is None
+    assert tokens.verify(payload + '.' + signature[:-2] + 'xx') is None
+    for bad in (None, '', 'garbage', 'a.b.c'):
+        assert tokens.verify(bad) is None
+
+
+def test_expired_tokens_are_rejected(monkeypatch):
+    tokens = SessionTokens('secret', ttl_seconds=60)
+    token = tokens.issue(USER)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert tokens.verify(token) is None
+
+
+def test_session_is_refreshed_only_after_the_row_changes(users):
+    auth = Auth()
+    auth.signup('ann', 'pw')
+    token = auth.login('ann', 'pw')[2]
+
+    snapshot, same = auth.resolve_session(token)
+    assert same == token and snapshot['username'] == 'ann'
+
+    auth.ledger.credit('ann', 10, SIGNUP_BONUS)  # Bumps the row version
+    snapshot, refreshed = auth.resolve_session(token)
+    assert refreshed != token
+    assert snapshot['version'] == users.get_user('ann').version
+    assert auth.resolve_session(refreshed)[1] == refreshed
+
+    assert auth.resolve_session('forged.token') == (None, None)
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+import pytest
+
+from utils.database import get_connection
+from utils.ledger import STREAK_BONUS
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def economy(users):
+    from utils.virtual_economy import VirtualEconomy
+    return VirtualEconomy()
+
+
+def set_user(users, username, **fields):
+    users.update_user(username, **fields)
+    return users.get_user(username)
+
+
+def rollovers():
+    return [tuple(row) for row in get_connection().execute(
+        "SELECT day, extended, reset FROM streak_rollovers ORDER BY day"
+    )]
+
+
+def test_first_visit_of_the_day_keeps_the_settled_streak(economy, make_user, users):
+    make_user('ann')
+    set_user(users, 'ann', streak=2, last_login=(TODAY - timedelta(days=1)).isoformat())
+
+    assert economy.check_daily_streak('ann') == 2
+    assert users.get_user('ann').last_login == TODAY.isoformat()
+    # A second visit writes nothing
+    version = users.get_user('ann').version
+    assert economy.check_daily_streak('ann') == 2
+    assert users.get_user('ann').version == version
+
+
+def test_rollover_extends_active_users_and_resets_the_rest(economy, make_user, users):
+    make_user('ann')
+    make_user('bob')
+    set_user(users, 'bob', streak=4, last_login=(TODAY - timedelta(days=3)).isoformat())
+    economy.check_daily_streak('ann')
+
+    assert economy.streaks.catch_up(TODAY + timedelta(days=1)) == 1
+    ann, bob = users.get_user('ann'), users.get_user('bob')
+    assert (ann.streak, bob.streak) == (1, 0)
+    assert ann.coins == 10
+    assert economy.ledger.balance('ann') == ann.coins
+    assert economy.ledger.history('ann')[0]['transaction_type'] == STREAK_BONUS
+    assert rollovers()[-1] == (TODAY.isoformat(), 1, 1)
+
+    # Already settled: nothing more to do for the same day
+    assert economy.streaks.catch_up(TODAY + timedelta(days=1)) == 0
+
+
+def test_rollover_catches_up_missed_days(economy, make_user, users):
+    make_user('ann')
+    economy.check_daily_streak('ann')
+
+    assert economy.streaks.catch_up(TODAY + timedelta(days=3)) == 3
+    assert [day for day, _, _ in rollovers()[-3:]] == [
+        (TODAY + timedelta(days=n)).isoformat() for n in range(3)
+    ]
+    # Active today only, so the streak is lost on the next day
+    assert users.get_user('ann').streak == 0
+    assert users.get_user('ann').coins == 10
+
+
+def test_users_credited_before_the_switch_are_not_credited_twice(data_dir, make_user, users):
+    from utils.virtual_economy import VirtualEconomy
+
+    # Visited today under the old per-visit check, which already counted the day
+    make_user('ann', streak=3, coins=30, last_login=TODAY.isoformat())
+    economy = VirtualEconomy()
+
+    economy.streaks.catch_up(TODAY + timedelta(days=1))
+    ann = users.get_user('ann')
+    assert (ann.streak, ann.coins) == (3, 30)
+    assert economy.ledger.balance('ann') == 30
@@ -0,0 +1,26 @@
+from utils.user_context import UserContext
+
+
+class StubDataManager:
+    def __init__(self):
+        self.reads = 0
+
+    def get_user_progress(self, username):
+        self.reads += 1
+        return [self.reads]
+
+    def get_progress_summary(self, username):
+        self.reads += 1
+        return {'reads': self.reads}
+
+
+def test_invalidate_reloads_progress_and_summary():
+    data_manager = StubDataManager()
+    context = UserContext('ann', auth=None, data_manager=data_manager)
+    assert context.summary == context.summary == {'reads': 1}
+    assert context.progress == [2]
+
+    context.invalidate()
+    assert context.summary == {'reads': 3}
+    assert context.progress == [4]
+    assert context.reads == 4
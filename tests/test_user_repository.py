@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from utils.user_model import UserRecord, achievement_mask
+from utils.user_repository import UserRepository
+
+
+def test_create_get_and_update(users, make_user):
+    make_user('ann', coins=5)
+    assert not users.create_user(UserRecord(username='ann', password='other'))
+    assert users.exists('ann') and not users.exists('bob')
+    assert users.get_user('bob') is None
+
+    assert users.update_user('ann', coins=7, streak=2)
+    ann = users.get_user('ann')
+    assert (ann.coins, ann.streak, ann.password) == (7, 2, 'secret')
+    assert not users.update_user('bob', coins=1)
+    with pytest.raises(ValueError):
+        users.update_user('ann', is_admin=1)
+
+
+def test_legacy_workbook_is_imported_once(data_dir):
+    legacy = data_dir / 'data' / 'users.xlsx'
+    pd.DataFrame([
+        {'username': 'ann', 'password': 'pw', 'coins': 120, 'level': 2, 'streak': 3,
+         'last_login': '2024-01-02', 'achievements': '["first_quiz"]', 'inventory': '[]'},
+        {'username': None, 'password': 'orphan', 'coins': 1, 'level': 1, 'streak': 0,
+         'last_login': None, 'achievements': None, 'inventory': None},
+    ]).to_excel(legacy, index=False)
+
+    users = UserRepository()
+    ann = users.get_user('ann')
+    assert (ann.coins, ann.level, ann.streak, ann.last_login) == (120, 2, 3, '2024-01-02')
+    assert ann.achievement_bits == achievement_mask(['first_quiz'])
+
+    users.update_user('ann', coins=0)
+    assert UserRepository().get_user('ann').coins == 0
+
+
+def test_unchanged_update_does_not_write(users, make_user):
+    make_user('ann', coins=5)
+    version = users.get_user('ann').version
+    assert users.update_user('ann', coins=5)
+    assert users.get_user('ann').version == version
+    assert users.update_user('ann', coins=6)
+    assert users.get_user('ann').version == version + 1
@@ -0,0 +1,153 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from utils.database import DB_PATH, get_connection, transaction, run_once
+from utils.progress_repository import ProgressRepository
+from utils.user_model import ACHIEVEMENT_BITS
+from utils.ledger import ACHIEVEMENT_AWARD, PURCHASE
+
+# Domain events the engine listens to
+QUIZ_COMPLETED = 'quiz_completed'
+STREAK_UPDATED = 'streak_updated'
+PURCHASE_MADE = 'purchase_made'
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """Award `achievement` once the user's `counter` reaches `threshold`."""
+    achievement: str
+    name: str
+    coins: int
+    event: str
+    counter: str
+    threshold: int
+
+
+# Every achievement id must also be listed in user_model.ACHIEVEMENT_IDS
+RULES = [
+    Rule('first_quiz', 'First Quiz', 50, QUIZ_COMPLETED, 'quizzes', 1),
+    Rule('perfect_score', 'Perfect Score', 100, QUIZ_COMPLETED, 'perfect_scores', 1),
+    Rule('streak_3', '3-Day Streak', 150, STREAK_UPDATED, 'best_streak', 3),
+    Rule('quiz_10', 'Ten Quizzes', 200, QUIZ_COMPLETED, 'quizzes', 10),
+    Rule('streak_7', '7-Day Streak', 300, STREAK_UPDATED, 'best_streak', 7),
+    Rule('first_purchase', 'First Purchase', 25, PURCHASE_MADE, 'purchases', 1),
+]
+
+
+def counter_updates(event, payload):
+    """Counter changes for an event as [(counter, value, combine)], combine being 'add' or 'max'."""
+    if event == QUIZ_COMPLETED:
+        return [('quizzes', 1, 'add'), ('perfect_scores', int(payload['score'] >= 100), 'add')]
+    if event == STREAK_UPDATED:
+        return [('best_streak', payload['streak'], 'max')]
+    if event == PURCHASE_MADE:
+        return [('purchases', 1, 'add')]
+    raise ValueError(f"Unknown achievement event: {event}")
+
+
+class AchievementEngine:
+    """Awards achievements from domain events.
+
+    Each event bumps a few per-user counters in `achievement_counters`, then
+    only the rules indexed under that event type and not yet earned are
+    checked against them, so the cost of an event does not grow with the
+    size of the catalogue. Awards set the user's achievement bit and credit
+    the coins in the same transaction as the counter update.
+    """
+
+    def __init__(self, users, ledger, rules=RULES, db_path=DB_PATH):
+        self.users = users
+        self.ledger = ledger
+        self.db_path = db_path
+        self.rules = {rule.achievement: rule for rule in rules}
+        self.rules_by_event = defaultdict(list)
+        for rule in rules:
+            if rule.achievement not in ACHIEVEMENT_BITS:
+                raise ValueError(f"Achievement {rule.achievement} has no bit in ACHIEVEMENT_IDS")
+            self.rules_by_event[rule.event].append(rule)
+
+        self._create_schema()
+        ProgressRepository(db_path)  # Counters are seeded from the progress log
+        run_once('seed_achievement_counters', self._seed_counters, db_path)
+
+    def _create_schema(self):
+        get_connection(self.db_path).execute("""
+            CREATE TABLE IF NOT EXISTS achievement_counters (
+                username TEXT NOT NULL,
+                counter TEXT NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY (username, counter)
+            )
+        """)
+
+    def _seed_counters(self, conn):
+        """Derive counters for activity recorded before the engine existed."""
+        conn.execute("""
+            INSERT OR REPLACE INTO achievement_counters (username, counter, value)
+            SELECT username, 'quizzes', COUNT(*) FROM progress GROUP BY username
+            UNION ALL
+            SELECT username, 'perfect_scores', SUM(score >= 100) FROM progress GROUP BY username
+            UNION ALL
+            SELECT username, 'best_streak', streak FROM users
+            UNION ALL
+            SELECT username, 'purchases', COUNT(*) FROM transactions
+            WHERE transaction_type = ? GROUP BY username
+        """, (PURCHASE,))
+
+    def handle(self, username, event, **payload):
+        """Apply an event and return the achievement ids it newly awarded."""
+        with transaction(self.db_path) as conn:
+            for counter, value, combine in counter_updates(event, payload):
+                merged = "value + excluded.value" if combine == 'add' else "MAX(value, excluded.value)"
+                conn.execute(f"""
+                    INSERT INTO achievement_counters (username, counter, value) VALUES (?, ?, ?)
+                    ON CONFLICT (username, counter) DO UPDATE SET value = {merged}
+                """, (username, counter, value))
+
+            row = conn.execute(
+                "SELECT achievement_bits FROM users WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                return []
+            pending = [
+                rule for rule in self.rules_by_event[event]
+                if not row['achievement_bits'] & ACHIEVEMENT_BITS[rule.achievement]
+            ]
+            if not pending:
+                return []
+
+            counters = {
+                counter_row['counter']: counter_row['value']
+                for counter_row in conn.execute(
+                    f"SELECT counter, value FROM achievement_counters WHERE username = ? "
+                    f"AND counter IN ({', '.join('?' * len(pending))})",
+                    [username, *(rule.counter for rule in pending)]
+                )
+            }
+            earned = [rule.achievement for rule in pending
+                      if counters.get(rule.counter, 0) >= rule.threshold]
+            return self.award(username, earned)
+
+    def award(self, username, achievements):
+        """Set achievement bits and credit their coins atomically.
+
+        Returns the achievements that were newly awarded.
+        """
+        awarded = []
+        if not achievements:
+            return awarded
+        with transaction(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT achievement_bits FROM users WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                return awarded
+            bits = row['achievement_bits']
+            for achievement in achievements:
+                if bits & ACHIEVEMENT_BITS[achievement]:
+                    continue
+                bits |= ACHIEVEMENT_BITS[achievement]
+                self.ledger.credit(username, self.rules[achievement].coins, ACHIEVEMENT_AWARD, achievement)
+                awarded.append(achievement)
+            if awarded:
+                self.users.update_user(username, achievement_bits=bits)
+        return awarded
@@ -0,0 +1,205 @@
+# utils/adaptive.py
+"""Adaptive selection of static-bank questions.
+
+Items and students are placed on one scale with a two-parameter logistic
+(2PL) model: a student of ability theta answers an item of difficulty b and
+discrimination a correctly with probability 1 / (1 + exp(-a (theta - b))).
+The next questions are the ones carrying the most Fisher information,
+a^2 p (1 - p), at the student's current ability, which is scored for the
+whole candidate pool in a single NumPy pass.
+
+Every submitted answer nudges the student's ability and the item's
+parameters towards the observed outcome (an Elo-style online update, with
+step sizes that shrink as attempts accumulate), so no batch re-estimation
+is needed. During a quiz the ability is advanced in memory with
+`estimate`, and the answers are stored together with `record_answers`
+when the quiz ends.
+"""
+import threading
+import numpy as np
+from utils.database import DB_PATH, get_connection, transaction
+
+DIFFICULTY_PRIORS = {'easy': -1.0, 'medium': 0.0, 'hard': 1.0}
+DEFAULT_DISCRIMINATION = 1.0
+SCALE_LIMIT = 4.0
+DISCRIMINATION_RANGE = (0.25, 3.0)
+# Small random jitter so equally informative items are not always served in bank order
+SELECTION_NOISE = 0.01
+
+
+def _step(attempts, base=0.6, floor=0.05):
+    """Learning rate that decays as more answers have been seen."""
+    return max(floor, base / (1 + 0.1 * attempts))
+
+
+def _update(theta, user_attempts, b, a, item_attempts, y):
+    """One online step; returns the new (theta, difficulty, discrimination)."""
+    residual = y - 1.0 / (1.0 + np.exp(-a * (theta - b)))
+    user_step, item_step = _step(user_attempts), _step(item_attempts)
+    return (
+        float(np.clip(theta + user_step * a * residual, -SCALE_LIMIT, SCALE_LIMIT)),
+        float(np.clip(b - item_step * a * residual, -SCALE_LIMIT, SCALE_LIMIT)),
+        float(np.clip(a + item_step * 0.2 * residual * (theta - b), *DISCRIMINATION_RANGE)),
+    )
+
+
+class ItemPool:
+    """Question dicts for one language with their parameters as NumPy arrays."""
+
+    def __init__(self, items, stats):
+        self.items = items
+        self.ids = [item['id'] for item in items]
+        self.index = {item_id: i for i, item_id in enumerate(self.ids)}
+        self.difficulty = np.array(
+            [DIFFICULTY_PRIORS.get(item.get('difficulty'), 0.0) for item in items], dtype=np.float64
+        )
+        self.discrimination = np.full(len(items), DEFAULT_DISCRIMINATION, dtype=np.float64)
+        for item_id, difficulty, discrimination in stats:
+            i = self.index.get(item_id)
+            if i is not None:
+                self.difficulty[i] = difficulty
+                self.discrimination[i] = discrimination
+
+
+class AdaptiveSelector:
+    def __init__(self, content, db_path=DB_PATH, seed=None):
+        self.content = content
+        self.db_path = db_path
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+        self._create_schema()
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS item_stats (
+                item_id TEXT PRIMARY KEY,
+                language TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                difficulty REAL NOT NULL,
+                discrimination REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_item_stats_language ON item_stats (language)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_ability (
+                username TEXT NOT NULL,
+                language TEXT NOT NULL,
+                theta REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (username, language)
+            )
+        """)
+
+    def _pool(self, language):
+        pool = self._pools.get(language)
+        if pool is None:
+            stats = get_connection(self.db_path).execute(
+                "SELECT item_id, difficulty, discrimination FROM item_stats WHERE language = ?",
+                (language,)
+            ).fetchall()
+            with self._lock:
+                pool = self._pools.setdefault(
+                    language, ItemPool(self.content.questions(language), stats)
+                )
+        return pool
+
+    def ability(self, username, language):
+        """The student's current ability estimate (0 is average)."""
+        return self.ability_state(username, language)[0]
+
+    def ability_state(self, username, language):
+        """(ability, answers seen) for the student."""
+        row = get_connection(self.db_path).execute(
+            "SELECT theta, attempts FROM user_ability WHERE username = ? AND language = ?",
+            (username, language)
+        ).fetchone()
+        return (row['theta'], row['attempts']) if row else (0.0, 0)
+
+    def estimate(self, language, theta, attempts, item_id, correct):
+        """The ability after one more answer, computed in memory without storing it."""
+        pool = self._pool(language)
+        i = pool.index.get(item_id)
+        if i is None:
+            return theta
+        with self._lock:
+            b, a = float(pool.difficulty[i]), float(pool.discrimination[i])
+        return _update(theta, attempts, b, a, 0, 1.0 if correct else 0.0)[0]
+
+    def select(self, username, language, count, exclude=(), theta=None):
+        """The `count` most informative questions for the student, best first.
+
+        Pass `theta` to rank for an in-memory ability instead of the stored one.
+        """
+        pool = self._pool(language)
+        if not pool.items or count <= 0:
+            return []
+        if theta is None:
+            theta = self.ability(username, language)
+
+        with self._lock:
+            a = pool.discrimination
+            p = 1.0 / (1.0 + np.exp(-a * (theta - pool.difficulty)))
+            information = a * a * p * (1.0 - p)
+            information += self._rng.uniform(0, SELECTION_NOISE, len(information))
+        excluded = [pool.index[item_id] for item_id in exclude if item_id in pool.index]
+        information[excluded] = -np.inf
+
+        count = min(count, len(pool.items) - len(excluded))
+        if count <= 0:
+            return []
+        best = np.argpartition(information, -count)[-count:]
+        best = best[np.argsort(information[best])[::-1]]
+        return [pool.items[i] for i in best]
+
+    def record_answer(self, username, language, item_id, correct):
+        """Update the student's ability and the item's parameters from one answer."""
+        self.record_answers(username, language, [(item_id, correct)])
+
+    def record_answers(self, username, language, answers):
+        """Apply a quiz's (item_id, correct) answers in order, in one transaction."""
+        pool = self._pool(language)
+        answers = [(item_id, correct) for item_id, correct in answers if item_id in pool.index]
+        if not answers:
+            return
+
+        updated = {}
+        with transaction(self.db_path) as conn:
+            theta, user_attempts = self.ability_state(username, language)
+            for item_id, correct in answers:
+                y = 1.0 if correct else 0.0
+                i = pool.index[item_id]
+                item = conn.execute(
+                    "SELECT attempts, difficulty, discrimination FROM item_stats WHERE item_id = ?",
+                    (item_id,)
+                ).fetchone()
+                if item:
+                    item_attempts, b, a = item['attempts'], item['difficulty'], item['discrimination']
+                else:
+                    item_attempts, b, a = 0, float(pool.difficulty[i]), float(pool.discrimination[i])
+
+                theta, new_b, new_a = _update(theta, user_attempts, b, a, item_attempts, y)
+                user_attempts += 1
+                conn.execute("""
+                    INSERT INTO item_stats (item_id, language, attempts, correct, difficulty, discrimination)
+                    VALUES (?, ?, 1, ?, ?, ?)
+                    ON CONFLICT (item_id) DO UPDATE SET
+                        attempts = attempts + 1,
+                        correct = correct + excluded.correct,
+                        difficulty = excluded.difficulty,
+                        discrimination = excluded.discrimination
+                """, (item_id, language, int(y), new_b, new_a))
+                updated[i] = (new_b, new_a)
+
+            conn.execute("""
+                INSERT INTO user_ability (username, language, theta, attempts) VALUES (?, ?, ?, ?)
+                ON CONFLICT (username, language) DO UPDATE SET
+                    theta = excluded.theta, attempts = excluded.attempts
+            """, (username, language, theta, user_attempts))
+
+        with self._lock:
+            for i, (new_b, new_a) in updated.items():
+                pool.difficulty[i] = new_b
+                pool.discrimination[i] = new_a
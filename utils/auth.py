@@ -1,89 +1,117 @@
 import streamlit as st
-import pandas as pd
-import json
-from pathlib import Path
 from datetime import datetime
+from utils.database import transaction
+from utils.user_repository import UserRepository, known_version
+from utils.user_model import UserRecord
+from utils.session_tokens import SessionTokens
+from utils.ledger import CoinLedger, SIGNUP_BONUS
+from utils import tracing
+from utils.passwords import (
+    DEFAULT_ITERATIONS, hash_password, verify_password, needs_rehash, dummy_verify,
+    VerifiedCredentialCache
+)
 
+@tracing.instrument('auth')
 class Auth:
-    def __init__(self):
-        self.users_file = "data/users.xlsx"
-        Path("data").mkdir(exist_ok=True)
-
-        if not Path(self.users_file).exists():
-            df = pd.DataFrame(columns=[
-                'username', 'password', 'coins', 'level', 'achievements',
-                'inventory', 'streak', 'last_login'  # New columns
-            ])
-            df.to_excel(self.users_file, index=False)
-            print(f"Created new users file at {self.users_file}")
+    def __init__(self, password_iterations=None):
+        self.users = UserRepository()
+        self.ledger = CoinLedger()
+        self.password_iterations = password_iterations or DEFAULT_ITERATIONS
+        # Lets repeat logins skip the deliberately slow password hash
+        self.verified = VerifiedCredentialCache()
+        self.tokens = SessionTokens()
 
     def signup(self, username, password):
         try:
             if not username or not password:
                 return False, "Username and password are required"
 
-            df = pd.read_excel(self.users_file)
-            if username in df['username'].values:
-                return False, "Username already exists"
+            new_user = UserRecord(
+                username=username,
+                password=hash_password(password, self.password_iterations),
+                coins=0,  # Welcome bonus is credited through the ledger below
+                level=1,
+                streak=0,  # Initialize streak
+                last_login=datetime.now().date().isoformat()  # Set initial login date
+            )
 
-            # Ensure password is stored as string
-            new_user = pd.DataFrame({
-                'username': [username],
-                'password': [str(password)],  # Convert password to string
-                'coins': [100],  # Welcome bonus
-                'level': [1],
-                'achievements': [json.dumps([])],
-                'inventory': [json.dumps([])],  # Initialize empty inventory
-                'streak': [0],  # Initialize streak
-                'last_login': [datetime.now().date().isoformat()]  # Set initial login date
-            })
+            with transaction(self.users.db_path):
+                if not self.users.create_user(new_user):
+                    return False, "Username already exists"
+                self.ledger.credit(username, 100, SIGNUP_BONUS)
 
-            df = pd.concat([df, new_user], ignore_index=True)
-            df['password'] = df['password'].astype(str)  # Ensure all passwords are strings
-            df.to_excel(self.users_file, index=False)
             print(f"Successfully created new user: {username}")
-            print(f"Current users in database: {df['username'].tolist()}")
             return True, "Signup successful! Welcome bonus: 100 coins"
         except Exception as e:
             print(f"Error during signup: {str(e)}")
             return False, f"Signup failed: {str(e)}"
 
     def login(self, username, password):
+        """Check credentials. Returns (success, message, session token or None)."""
         try:
             if not username or not password:
-                return False, "Username and password are required"
+                return False, "Username and password are required", None
 
-            df = pd.read_excel(self.users_file)
-            df['password'] = df['password'].astype(str)  # Convert all passwords to strings
-            print(f"All users in database: {df['username'].tolist()}")
+            user = self.users.get_user(username)
+            if user is None:
+                dummy_verify(password, self.password_iterations)  # Same cost as a real check
+                tracing.increment('auth.login.user_not_found')
+                return False, "User not found", None
 
-            user = df[df['username'] == username]
-            print(f"Attempting login for user: {username}")
-            print(f"Found user data: {not user.empty}")
+            stored_password = user.password
+            if self.verified.contains(username, password, stored_password):
+                tracing.increment('auth.login.cached')
+                return True, "Login successful", self.tokens.issue(user)
 
-            if user.empty:
-                return False, "User not found"
+            if not verify_password(password, stored_password):
+                tracing.increment('auth.login.invalid_password')
+                return False, "Invalid password", None
 
-            stored_password = str(user.iloc[0]['password'])  # Convert stored password to string
-            input_password = str(password)  # Convert input password to string
-            print(f"Password match: {stored_password == input_password}")
-
-            if stored_password == input_password:
-                print("Login successful")
-                return True, "Login successful"
-            return False, "Invalid password"
+            if needs_rehash(stored_password, self.password_iterations):
+                # Plaintext row or an old work factor: store a fresh hash
+                stored_password = hash_password(password, self.password_iterations)
+                self.users.compare_and_update(
+                    username, {'password': user.password}, password=stored_password
+                )
+                user = self.users.get_user(username)  # The rehash bumped the row version
+            self.verified.add(username, password, stored_password)
+            tracing.increment('auth.login.success')
+            return True, "Login successful", self.tokens.issue(user)
         except Exception as e:
             print(f"Error during login: {str(e)}")
-            return False, f"Login failed: {str(e)}"
+            return False, f"Login failed: {str(e)}", None
+
+    def resolve_session(self, token):
+        """
+        Validate a session token and return (snapshot, token).
+        
+        The snapshot ({'username', 'level', 'version', ...}) comes straight from
+        the token while the user's row is unchanged; the store is only read when
+        the row's version has moved on, and a refreshed token is returned then.
+        Returns (None, None) if the token is invalid or the user is gone.
+        """
+        snapshot = self.tokens.verify(token) if token else None
+        if snapshot is None:
+            return None, None
+
+        if snapshot['version'] == known_version(snapshot['username']):
+            tracing.increment('auth.session.current')
+            return snapshot, token
+
+        tracing.increment('auth.session.refreshed')
+        user = self.users.get_user(snapshot['username'])
+        if user is None:
+            return None, None
+        token = self.tokens.issue(user)
+        return self.tokens.verify(token), token
 
     def get_user_data(self, username):
         try:
-            df = pd.read_excel(self.users_file)
-            user = df[df['username'] == username]
-            if not user.empty:
-                return user.iloc[0].to_dict()
+            user = self.users.get_user(username)
+            if user is not None:
+                return user
             print(f"No data found for user: {username}")
             return None
         except Exception as e:
             print(f"Error getting user data: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,308 @@
+# utils/bulk_io.py
+"""Bulk import and export of users and progress.
+
+Input and output formats are picked from the file extension: .csv, .xlsx or
+.parquet (Parquet needs pyarrow, which is only imported when used). Files are
+streamed in chunks, so memory stays flat however many rows there are.
+
+Each import runs in a single transaction: either every valid row is loaded
+or, on error, none are. Usernames are validated a chunk at a time against
+the users table's primary-key index instead of one signup at a time.
+"""
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from utils.database import DB_PATH, get_connection, transaction
+from utils.excel_reader import iter_rows
+from utils.ledger import CoinLedger, OPENING_BALANCE, SIGNUP_BONUS
+from utils.passwords import MIGRATION_ITERATIONS, hash_password, is_hashed
+from utils.progress_repository import ProgressRepository
+from utils.user_repository import UserRepository, USER_COLUMNS
+
+CHUNK_SIZE = 5000
+# Stay well below SQLite's bound-parameter limit in IN (...) lookups
+LOOKUP_BATCH = 500
+SIGNUP_COINS = 100
+
+USER_EXPORT_COLUMNS = ['username', 'password', 'coins', 'level', 'streak', 'last_login']
+PROGRESS_EXPORT_COLUMNS = ['username', 'language', 'module', 'score', 'created_at', 'attempt_id']
+
+
+def _format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix not in ('.csv', '.xlsx', '.parquet'):
+        raise ValueError(f"Unsupported file type: {suffix or path} (use .csv, .xlsx or .parquet)")
+    return suffix
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet files need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def read_records(path):
+    """Yield each row of a CSV, XLSX or Parquet file as a dict keyed by header."""
+    suffix = _format(path)
+    if suffix == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            yield from csv.DictReader(f)
+    elif suffix == '.xlsx':
+        yield from iter_rows(path)
+    else:
+        parquet_file = _pyarrow().parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=CHUNK_SIZE):
+            yield from batch.to_pylist()
+
+
+def write_records(path, columns, rows):
+    """Stream rows (tuples in `columns` order) to a CSV, XLSX or Parquet file."""
+    suffix = _format(path)
+    count = 0
+    if suffix == '.csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for chunk in _chunks(rows, CHUNK_SIZE):
+                writer.writerows(chunk)
+                count += len(chunk)
+    elif suffix == '.xlsx':
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(columns)
+        for row in rows:
+            sheet.append(list(row))
+            count += 1
+        workbook.save(path)
+    else:
+        pyarrow = _pyarrow()
+        writer = None
+        try:
+            for chunk in _chunks(rows, CHUNK_SIZE):
+                table = pyarrow.Table.from_pylist([dict(zip(columns, row)) for row in chunk])
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                count += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            pyarrow.parquet.write_table(
+                pyarrow.table({column: [] for column in columns}), path
+            )
+    return count
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _existing_usernames(conn, usernames):
+    """The subset of `usernames` already in the users table."""
+    usernames = list(usernames)
+    found = set()
+    for start in range(0, len(usernames), LOOKUP_BATCH):
+        batch = usernames[start:start + LOOKUP_BATCH]
+        found.update(
+            row['username'] for row in conn.execute(
+                f"SELECT username FROM users WHERE username IN ({', '.join('?' * len(batch))})",
+                batch
+            )
+        )
+    return found
+
+
+def _text(value):
+    if value is None or value != value:  # NaN from pandas-written files
+        return ''
+    return str(value).strip()
+
+
+def _number(value, default, cast=int):
+    text = _text(value)
+    if not text:
+        return default
+    return cast(float(text))
+
+
+class BulkReport:
+    """Counts and the first few row errors from an import."""
+
+    MAX_ERRORS = 20
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []
+
+    def reject(self, line, reason):
+        self.skipped += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(f"row {line}: {reason}")
+
+    def __str__(self):
+        lines = [f"Imported {self.imported} rows, skipped {self.skipped}"]
+        lines.extend(f"  {error}" for error in self.errors)
+        if self.skipped > len(self.errors):
+            lines.append(f"  ... and {self.skipped - len(self.errors)} more")
+        return '\n'.join(lines)
+
+
+def import_users(path, iterations=None, workers=None, db_path=DB_PATH):
+    """Create users from a file with username and password columns.
+
+    Optional columns: coins, level, streak, last_login. Passwords that are
+    already pbkdf2 hashes (e.g. from export_users) are kept as they are;
+    plaintext ones are hashed on all cores with `iterations` rounds, by
+    default the interim MIGRATION_ITERATIONS that login upgrades. Users
+    get the signup bonus unless the file gives them a coin balance, which is
+    booked as an opening balance so the ledger still matches users.coins.
+    """
+    iterations = iterations or MIGRATION_ITERATIONS
+    UserRepository(db_path)
+    CoinLedger(db_path)
+    report = BulkReport()
+    today = datetime.now().date().isoformat()
+    seen = set()
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool, \
+            transaction(db_path) as conn:
+        line = 1
+        for chunk in _chunks(read_records(path), CHUNK_SIZE):
+            candidates = []
+            for record in chunk:
+                line += 1
+                username = _text(record.get('username'))
+                password = _text(record.get('password'))
+                if not username or not password:
+                    report.reject(line, "username and password are required")
+                    continue
+                if username in seen:
+                    report.reject(line, f"duplicate username {username!r} in file")
+                    continue
+                seen.add(username)
+                try:
+                    coins = _number(record.get('coins'), None)
+                    level = _number(record.get('level'), 1)
+                    streak = _number(record.get('streak'), 0)
+                except ValueError as e:
+                    report.reject(line, str(e))
+                    continue
+                last_login = _text(record.get('last_login'))[:10] or today
+                candidates.append((line, username, password, coins, level, streak, last_login))
+
+            existing = _existing_usernames(conn, (row[1] for row in candidates))
+            rows = []
+            for line_no, username, password, coins, level, streak, last_login in candidates:
+                if username in existing:
+                    report.reject(line_no, f"username {username!r} already exists")
+                    continue
+                rows.append((username, password, coins, level, streak, last_login))
+
+            # hashlib releases the GIL, so the KDF runs in parallel
+            hashes = pool.map(
+                lambda password: password if is_hashed(password) else hash_password(password, iterations),
+                [row[1] for row in rows]
+            )
+            users = []
+            entries = []
+            for (username, _, coins, level, streak, last_login), password in zip(rows, hashes):
+                balance = SIGNUP_COINS if coins is None else coins
+                users.append((username, password, balance, level, 0, streak, last_login))
+                if balance:
+                    entries.append((username, balance, SIGNUP_BONUS if coins is None else OPENING_BALANCE))
+
+            conn.executemany(
+                f"INSERT INTO users ({', '.join(USER_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(USER_COLUMNS))})",
+                users
+            )
+            conn.executemany(
+                "INSERT INTO transactions (username, item_id, amount, transaction_type, timestamp) "
+                "VALUES (?, NULL, ?, ?, ?)",
+                [(*entry, datetime.now().isoformat()) for entry in entries]
+            )
+            report.imported += len(users)
+    return report
+
+
+def import_progress(path, db_path=DB_PATH):
+    """Load quiz attempts from a file with username, language and score columns.
+
+    Optional columns: module, created_at, attempt_id. Rows for unknown users
+    are skipped, as are attempts whose attempt_id is already recorded, so
+    re-importing an export does not duplicate it. Every attempt goes through
+    the same path as a live quiz, so the leaderboard, progress summaries and
+    achievements stay consistent.
+    """
+    from utils.data_manager import DataManager
+    from utils.gamification import GamificationSystem
+
+    data_manager = DataManager(db_path)
+    gamification = GamificationSystem(db_path)
+    report = BulkReport()
+
+    with transaction(db_path) as conn:
+        line = 1
+        for chunk in _chunks(read_records(path), CHUNK_SIZE):
+            existing = _existing_usernames(conn, {_text(record.get('username')) for record in chunk})
+            for record in chunk:
+                line += 1
+                username = _text(record.get('username'))
+                language = _text(record.get('language'))
+                if username not in existing:
+                    report.reject(line, f"unknown user {username!r}")
+                    continue
+                if not language:
+                    report.reject(line, "language is required")
+                    continue
+                try:
+                    score = _number(record.get('score'), None, float)
+                    created_at = _text(record.get('created_at'))
+                    when = datetime.fromisoformat(created_at) if created_at else None
+                except ValueError as e:
+                    report.reject(line, str(e))
+                    continue
+                if score is None or not 0 <= score <= 100:
+                    report.reject(line, "score must be between 0 and 100")
+                    continue
+
+                module = _text(record.get('module')) or None
+                attempt_id = _text(record.get('attempt_id')) or None
+                if not data_manager.save_progress(username, language, module, score, when, attempt_id):
+                    report.reject(line, f"attempt {attempt_id!r} already recorded")
+                    continue
+                gamification.record_quiz(username, score)
+                report.imported += 1
+    return report
+
+
+def export_users(path, db_path=DB_PATH):
+    """Write every user (with password hashes) to a file import_users accepts."""
+    UserRepository(db_path)
+    cursor = get_connection(db_path).execute(
+        f"SELECT {', '.join(USER_EXPORT_COLUMNS)} FROM users ORDER BY username"
+    )
+    return write_records(path, USER_EXPORT_COLUMNS, (tuple(row) for row in cursor))
+
+
+def export_progress(path, db_path=DB_PATH):
+    """Write the whole progress log, oldest first."""
+    ProgressRepository(db_path)
+    cursor = get_connection(db_path).execute(
+        f"SELECT {', '.join(PROGRESS_EXPORT_COLUMNS)} FROM progress ORDER BY id"
+    )
+    return write_records(path, PROGRESS_EXPORT_COLUMNS, (tuple(row) for row in cursor))
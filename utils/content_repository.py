@@ -0,0 +1,162 @@
+# utils/content_repository.py
+"""Reading passages, question banks and lessons, authored as JSON packs.
+
+Every `*.json` file in the content directory is a pack holding any of
+"passages", "questions" and "lessons" lists. Each item has an "id" plus
+language/skill/topic/difficulty (lessons use language/module) and its text.
+Packs are indexed into SQLite on startup whenever a file changes: a B-tree
+index serves lookups by language, skill, topic and difficulty, and an FTS5
+table serves full-text search. Query results are kept in an LRU cache, so a
+rerun never rebuilds content, however many passages authors add.
+"""
+import hashlib
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+from utils.database import DB_PATH, get_connection, transaction
+
+CONTENT_DIR = "content"
+PASSAGE = 'passage'
+QUESTION = 'question'
+LESSON = 'lesson'
+PACK_KEYS = {'passages': PASSAGE, 'questions': QUESTION, 'lessons': LESSON}
+CACHE_SIZE = 256
+
+
+class ContentRepository:
+    def __init__(self, content_dir=CONTENT_DIR, db_path=DB_PATH):
+        self.content_dir = Path(content_dir)
+        self.db_path = db_path
+        self._create_schema()
+        self.reindex()
+        self._find = lru_cache(maxsize=CACHE_SIZE)(self._query)
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS content_items (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                language TEXT NOT NULL,
+                skill TEXT,
+                topic TEXT,
+                difficulty TEXT,
+                title TEXT,
+                body TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_content_lookup "
+            "ON content_items (kind, language, skill, topic, difficulty)"
+        )
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS content_search USING fts5 (
+                title, body, content='content_items', content_rowid='rowid'
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS content_packs (
+                signature TEXT NOT NULL
+            )
+        """)
+
+    def _signature(self):
+        digest = hashlib.sha256()
+        for path in sorted(self.content_dir.glob('*.json')):
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def reindex(self, force=False):
+        """Reload the packs if any file was added, removed or changed. Returns True if it did."""
+        signature = self._signature()
+        conn = get_connection(self.db_path)
+        stored = conn.execute("SELECT signature FROM content_packs").fetchone()
+        if not force and stored and stored['signature'] == signature:
+            return False
+
+        rows = []
+        for path in sorted(self.content_dir.glob('*.json')):
+            with open(path, encoding='utf-8') as f:
+                pack = json.load(f)
+            for key, kind in PACK_KEYS.items():
+                for item in pack.get(key, []):
+                    rows.append((
+                        item['id'], kind, item['language'],
+                        item.get('skill', item.get('module')), item.get('topic'),
+                        item.get('difficulty'), item.get('title'),
+                        item.get('text') or item.get('question', ''),
+                        json.dumps(item, ensure_ascii=False)
+                    ))
+
+        with transaction(self.db_path) as conn:
+            conn.execute("DELETE FROM content_items")
+            conn.executemany("""
+                INSERT INTO content_items (id, kind, language, skill, topic, difficulty, title, body, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.execute("INSERT INTO content_search (content_search) VALUES ('rebuild')")
+            conn.execute("DELETE FROM content_packs")
+            conn.execute("INSERT INTO content_packs (signature) VALUES (?)", (signature,))
+        if hasattr(self, '_find'):
+            self._find.cache_clear()
+        print(f"Indexed {len(rows)} content items from {self.content_dir}")
+        return True
+
+    def _query(self, kind, language, skill, topic, difficulty):
+        conditions = ["kind = ?", "language = ?"]
+        params = [kind, language]
+        for column, value in (('skill', skill), ('topic', topic), ('difficulty', difficulty)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        rows = get_connection(self.db_path).execute(
+            f"SELECT data FROM content_items WHERE {' AND '.join(conditions)} ORDER BY rowid",
+            params
+        )
+        return tuple(json.loads(row['data']) for row in rows)
+
+    def passages(self, language, skill=None, topic=None, difficulty=None):
+        """Passage dicts (id, title, text, ...) matching the filters, in pack order."""
+        return self._find(PASSAGE, language, skill, topic, difficulty)
+
+    def random_passage(self, language, skill=None, topic=None, difficulty=None):
+        passages = self.passages(language, skill, topic, difficulty)
+        return random.choice(passages) if passages else None
+
+    def questions(self, language, skill=None, topic=None, difficulty=None):
+        """Question dicts (question, options, correct, ...) from the static banks."""
+        return self._find(QUESTION, language, skill, topic, difficulty)
+
+    def lessons(self, language):
+        return self._find(LESSON, language, None, None, None)
+
+    def lesson(self, language, module):
+        """The lesson dict for a module, or None."""
+        matches = self._find(LESSON, language, module, None, None)
+        return matches[0] if matches else None
+
+    def search(self, text, kind=None, language=None, limit=20):
+        """Full-text search over titles and bodies, best matches first."""
+        # Quote every term so user input is never parsed as FTS syntax
+        terms = ' '.join('"' + term.replace('"', '""') + '"' for term in text.split())
+        if not terms:
+            return []
+        conditions = ["content_search MATCH ?"]
+        params = [terms]
+        if kind is not None:
+            conditions.append("c.kind = ?")
+            params.append(kind)
+        if language is not None:
+            conditions.append("c.language = ?")
+            params.append(language)
+        rows = get_connection(self.db_path).execute(f"""
+            SELECT c.kind, c.data FROM content_search
+            JOIN content_items c ON c.rowid = content_search.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY content_search.rank LIMIT ?
+        """, [*params, limit])
+        return [dict(json.loads(row['data']), kind=row['kind']) for row in rows]
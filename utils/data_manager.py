@@ -1,32 +1,46 @@
 import pandas as pd
-import json
-from pathlib import Path
+from datetime import datetime
+from utils.database import DB_PATH, transaction
+from utils.progress_repository import ProgressRepository, PROGRESS_COLUMNS
+from utils.leaderboard import Leaderboard
+from utils.progress_summary import ProgressSummaries
+from utils import tracing
 
+@tracing.instrument('data_manager')
 class DataManager:
-    def __init__(self):
-        self.progress_file = "data/progress.xlsx"
-        Path("data").mkdir(exist_ok=True)
-        
-        if not Path(self.progress_file).exists():
-            df = pd.DataFrame(columns=['username', 'language', 'module', 'score', 'completed'])
-            df.to_excel(self.progress_file, index=False)
+    def __init__(self, db_path=DB_PATH):
+        self.progress = ProgressRepository(db_path)
+        self.leaderboard = Leaderboard(db_path)
+        self.summaries = ProgressSummaries(db_path)
 
-    def save_progress(self, username, language, module, score):
-        df = pd.read_excel(self.progress_file)
-        new_progress = {
-            'username': username,
-            'language': language,
-            'module': module,
-            'score': score,
-            'completed': True
-        }
-        df = df.append(new_progress, ignore_index=True)
-        df.to_excel(self.progress_file, index=False)
+    def save_progress(self, username, language, module, score, when=None, attempt_id=None):
+        """Record a completed attempt. Returns False if `attempt_id` was already saved."""
+        # The leaderboard and summaries are updated in the same transaction so
+        # they never drift from the progress log, and only for a new attempt.
+        when = when or datetime.now()
+        with transaction(self.progress.db_path):
+            if self.progress.append(username, language, module, score, completed=True,
+                                    when=when, attempt_id=attempt_id) is None:
+                return False
+            self.leaderboard.record(username, language, score, when)
+            self.summaries.record(username, language, module, score, when)
+        return True
 
-    def get_user_progress(self, username):
-        df = pd.read_excel(self.progress_file)
-        return df[df['username'] == username]
+    def get_user_progress(self, username, language=None):
+        rows = self.progress.get_user_rows(username, language)
+        df = pd.DataFrame(rows, columns=PROGRESS_COLUMNS)
+        df['completed'] = df['completed'].astype(bool)
+        return df
 
-    def get_leaderboard(self):
-        df = pd.read_excel(self.progress_file)
-        return df.groupby('username')['score'].mean().sort_values(ascending=False).head(10)
+    def get_progress_summary(self, username):
+        """Per-language stats and recent activity for the dashboard, in one lookup."""
+        return self.summaries.get(username)
+
+    def get_leaderboard(self, language=None, period='all', limit=10):
+        top = self.leaderboard.top(language, period, limit)
+        return pd.Series(
+            [score for _, score in top],
+            index=[username for username, _ in top],
+            name='score',
+            dtype=float
+        )
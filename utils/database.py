@@ -0,0 +1,95 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+DB_PATH = "data/virtual_economy.db"
+
+_local = threading.local()
+
+
+def get_connection(db_path=DB_PATH):
+    """Return this thread's connection to the given database.
+
+    sqlite3 connections must not be shared between threads without a lock,
+    so they are cached per thread. Streamlit runs each rerun in a fresh
+    ScriptRunner thread, so a page render opens its own connection once and
+    reuses it for every query; it is closed when that thread's locals are
+    collected.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; write batches go through transaction() below.
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[db_path] = conn
+    return conn
+
+
+@contextmanager
+def transaction(db_path=DB_PATH):
+    """Run a block of statements as one write transaction.
+
+    Nested calls on the same thread join the outer transaction, so services
+    can compose (e.g. a purchase that also awards an achievement).
+    """
+    conn = get_connection(db_path)
+    depths = getattr(_local, 'depths', None)
+    if depths is None:
+        depths = _local.depths = {}
+
+    depth = depths.get(db_path, 0)
+    if depth == 0:
+        conn.execute("BEGIN IMMEDIATE")
+    depths[db_path] = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        depths[db_path] = depth
+        if depth == 0:
+            conn.execute("ROLLBACK")
+        raise
+    else:
+        depths[db_path] = depth
+        if depth == 0:
+            conn.execute("COMMIT")
+
+
+def run_once(name, migration, db_path=DB_PATH):
+    """Apply a named one-shot migration if it has not been recorded yet."""
+    conn = get_connection(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name TEXT PRIMARY KEY,
+            applied_at TEXT
+        )
+    """)
+    if conn.execute("SELECT 1 FROM schema_migrations WHERE name = ?", (name,)).fetchone():
+        return False
+
+    with transaction(db_path) as conn:
+        # Re-check under the write lock in case another session got here first.
+        if conn.execute("SELECT 1 FROM schema_migrations WHERE name = ?", (name,)).fetchone():
+            return False
+        migration(conn)
+        conn.execute(
+            "INSERT INTO schema_migrations (name, applied_at) VALUES (?, ?)",
+            (name, datetime.now().isoformat())
+        )
+    return True
+
+
+def close_connections():
+    """Close this thread's cached connections (e.g. after switching data dirs)."""
+    connections = getattr(_local, 'connections', None) or {}
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
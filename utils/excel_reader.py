@@ -0,0 +1,74 @@
+# utils/excel_reader.py
+"""Streaming reader for the legacy Excel workbooks.
+
+pd.read_excel parses the whole sheet into memory before returning anything.
+These helpers use openpyxl's read-only mode, which parses the sheet XML
+incrementally, and hand rows out one at a time or in fixed-size chunks, so
+memory stays bounded by the chunk size rather than the workbook size.
+
+    python -m utils.excel_reader summary data/progress.xlsx
+
+prints per-language attempt counts and average scores for a progress
+workbook without loading it whole.
+"""
+from itertools import islice
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_rows(path, sheet=None):
+    """Yield each data row of a sheet as a dict keyed by the header row.
+
+    Empty cells come back as None and completely empty rows are skipped.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = [str(name).strip() if name is not None else '' for name in next(rows, ())]
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, sheet=None):
+    """Yield lists of at most `chunk_size` row dicts."""
+    rows = iter_rows(path, sheet)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def summarize_progress(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return {language: (attempts, average score)} for a progress workbook."""
+    totals = {}
+    for chunk in iter_chunks(path, chunk_size):
+        for record in chunk:
+            if record.get('language') is None or record.get('score') is None:
+                continue
+            attempts, score_sum = totals.get(record['language'], (0, 0.0))
+            totals[record['language']] = (attempts + 1, score_sum + float(record['score']))
+    return {
+        language: (attempts, score_sum / attempts)
+        for language, (attempts, score_sum) in sorted(totals.items())
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Legacy workbook reports")
+    parser.add_argument('command', choices=['summary'])
+    parser.add_argument('path', nargs='?', default='data/progress.xlsx')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    for language, (attempts, average) in summarize_progress(args.path, args.chunk_size).items():
+        print(f"{language:<24}{attempts:>10} attempts{average:>10.1f}% average")
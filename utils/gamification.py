@@ -1,28 +1,30 @@
-import pandas as pd
-import json
+from utils.database import DB_PATH
+from utils.user_repository import UserRepository
+from utils.ledger import CoinLedger
+from utils.achievements import AchievementEngine, RULES, QUIZ_COMPLETED
 
 class GamificationSystem:
-    def __init__(self):
+    def __init__(self, db_path=DB_PATH):
         self.achievements = {
-            'first_quiz': {'name': 'First Quiz', 'coins': 50},
-            'perfect_score': {'name': 'Perfect Score', 'coins': 100},
-            'streak_3': {'name': '3-Day Streak', 'coins': 150}
+            rule.achievement: {'name': rule.name, 'coins': rule.coins} for rule in RULES
         }
+        self.users = UserRepository(db_path)
+        self.ledger = CoinLedger(db_path)
+        self.engine = AchievementEngine(self.users, self.ledger, db_path=db_path)
 
     def calculate_level(self, total_score):
         return int(total_score / 1000) + 1
 
-    def check_achievements(self, username, score, user_data):
-        earned_achievements = []
-        current_achievements = json.loads(user_data['achievements'])
-
-        if score == 100 and 'perfect_score' not in current_achievements:
-            earned_achievements.append('perfect_score')
+    def award_coins(self, achievement):
+        return self.achievements[achievement]['coins']
 
-        if len(current_achievements) == 0:
-            earned_achievements.append('first_quiz')
+    def record_quiz(self, username, score):
+        """Feed a completed quiz to the achievement engine; returns new achievements."""
+        return self.engine.handle(username, QUIZ_COMPLETED, score=score)
 
-        return earned_achievements
+    def award_achievements(self, username, achievements):
+        """Record earned achievements and credit their coins in one transaction.
 
-    def award_coins(self, achievement):
-        return self.achievements[achievement]['coins']
+        Returns the achievements that were newly awarded.
+        """
+        return self.engine.award(username, achievements)
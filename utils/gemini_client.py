@@ -0,0 +1,192 @@
+# utils/gemini_client.py
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import List, Optional
+from utils import tracing
+
+MODEL_NAME = 'Gemini 2.0 Flash'
+
+# One pool for every client, so the cap holds even with several models
+MAX_CONCURRENCY = 4
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="gemini")
+
+# Calls whose caller gave up on the deadline but that still hold a worker
+_hung = 0
+_hung_lock = threading.Lock()
+
+# How often a caller waiting for a free worker checks whether the pool is stuck
+QUEUE_POLL = 0.05
+
+# google.api_core errors for 429 and 5xx responses, in case `code` is missing
+TRANSIENT_ERRORS = {
+    'TooManyRequests', 'ResourceExhausted', 'InternalServerError', 'BadGateway',
+    'ServiceUnavailable', 'GatewayTimeout', 'DeadlineExceeded'
+}
+
+
+class PoolExhausted(RuntimeError):
+    """Every worker is stuck on a call that already timed out."""
+
+
+def hung_calls() -> int:
+    with _hung_lock:
+        return _hung
+
+
+def _release_hung(_future):
+    global _hung
+    with _hung_lock:
+        _hung -= 1
+
+
+def _give_up(future):
+    """Count a timed-out call against the pool until it actually returns."""
+    global _hung
+    if future.cancel():
+        return
+    with _hung_lock:
+        _hung += 1
+    future.add_done_callback(_release_hung)
+
+
+def pool_exhausted() -> bool:
+    return hung_calls() >= MAX_CONCURRENCY
+
+
+def is_transient(error) -> bool:
+    """Whether a failed call is worth retrying: timeouts, 429 and 5xx."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    for attr in ('code', 'status_code'):
+        code = getattr(error, attr, None)
+        if isinstance(code, int):
+            return code == 429 or 500 <= code < 600
+    return type(error).__name__ in TRANSIENT_ERRORS
+
+
+@tracing.instrument('gemini_client')
+class GeminiClient:
+    """
+    Gateway to the Gemini model.
+
+    All clients share one worker pool, so at most MAX_CONCURRENCY requests are
+    in flight no matter how many Streamlit sessions or models are active.
+    Each call has a deadline counted from when it starts running, not from
+    when it was queued. Calls that outlive their deadline keep their worker
+    until they return; while such calls fill the pool, new ones fail fast
+    instead of queueing behind them. Timeouts, rate limits (429) and server
+    errors (5xx) are retried with jittered exponential backoff; anything else
+    is raised at once. Any object with a `generate_content(prompt)` method
+    returning something with a `.text` attribute can stand in for the model
+    (e.g. a local stub in tests).
+    """
+
+    def __init__(self, model=None, timeout: float = 30.0, max_retries: int = 2, backoff: float = 0.5):
+        self._model = model
+        self._model_lock = threading.Lock()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    # Initialize Gemini API (make sure you have your API key configured)
+                    genai.configure(api_key=os.environ.get('GEMINI_API_KEY', 'YOUR_GEMINI_API_KEY'))
+                    self._model = genai.GenerativeModel(MODEL_NAME)
+        return self._model
+
+    def _call(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+    def _submit(self, prompt: str):
+        """Queue a call. Returns the future and an event set once it starts running."""
+        if pool_exhausted():
+            raise PoolExhausted("All Gemini workers are stuck on timed-out calls")
+        started = threading.Event()
+
+        def run():
+            started.set()
+            return self._call(prompt)
+
+        return _executor.submit(run), started
+
+    def _should_retry(self, attempt: int, error) -> bool:
+        return attempt < self.max_retries and is_transient(error) and not pool_exhausted()
+
+    def _retry_delay(self, attempt: int) -> float:
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Return the model's text for a prompt, allowing each attempt `timeout` once running."""
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            future, started = self._submit(prompt)
+            try:
+                while not started.wait(QUEUE_POLL):
+                    if pool_exhausted() and future.cancel():
+                        raise PoolExhausted("All Gemini workers are stuck on timed-out calls")
+                return future.result(timeout=timeout)
+            except FutureTimeout:
+                _give_up(future)
+                error = TimeoutError(f"Gemini call exceeded {timeout}s")
+            except Exception as e:
+                error = e
+            if not self._should_retry(attempt, error):
+                raise error
+            tracing.increment('gemini_client.retry')
+            time.sleep(self._retry_delay(attempt))
+
+    async def generate_async(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Async version of `generate` sharing the same worker pool."""
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            future, started = self._submit(prompt)
+            try:
+                while not started.is_set():
+                    if pool_exhausted() and future.cancel():
+                        raise PoolExhausted("All Gemini workers are stuck on timed-out calls")
+                    await asyncio.sleep(QUEUE_POLL)
+                # Shielded so a timeout leaves the running call to `_give_up`
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except asyncio.TimeoutError:
+                _give_up(future)
+                error = TimeoutError(f"Gemini call exceeded {timeout}s")
+            except Exception as e:
+                error = e
+            if not self._should_retry(attempt, error):
+                raise error
+            tracing.increment('gemini_client.retry')
+            await asyncio.sleep(self._retry_delay(attempt))
+
+    async def generate_many_async(self, prompts: List[str], timeout: Optional[float] = None) -> List:
+        """Fan prompts out in parallel; failed prompts come back as exceptions."""
+        return await asyncio.gather(
+            *(self.generate_async(prompt, timeout) for prompt in prompts),
+            return_exceptions=True
+        )
+
+    def generate_many(self, prompts: List[str], timeout: Optional[float] = None) -> List:
+        """Blocking wrapper around `generate_many_async` for synchronous callers."""
+        return asyncio.run(self.generate_many_async(prompts, timeout))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> GeminiClient:
+    """Return the default client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GeminiClient()
+    return _client
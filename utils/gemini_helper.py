@@ -1,18 +1,58 @@
 # utils/gemini_helper.py
-import google.generativeai as genai
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from utils.llm_cache import LLMCache, content_key
+from utils.gemini_client import GeminiClient, get_client
+from utils import tracing
 
+# Bump whenever a prompt changes so stale cached responses are not served
+READING_PROMPT_VERSION = 1
+FEEDBACK_PROMPT_VERSION = 1
+QUESTION_CACHE_FILE = "data/question_cache.json"
+FEEDBACK_CACHE_FILE = "data/feedback_cache.json"
+
+FEEDBACK_MODEL = "model"
+FEEDBACK_CACHED = "cached"
+FEEDBACK_BACKGROUND = "background"
+
+# Explanations requested in "background" mode, shared by every session
+_feedback_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gemini-feedback")
+_pending_feedback = {}
+_pending_lock = threading.Lock()
+
+
+def _forget_feedback(key, future):
+    """Drop a finished request, so a failed fetch is retried on the next miss."""
+    with _pending_lock:
+        if _pending_feedback.get(key) is future:
+            del _pending_feedback[key]
+
+@tracing.instrument('gemini')
 class GeminiQuizSystem:
-    def __init__(self):
-        # Initialize Gemini API (make sure you have your API key configured)
-        genai.configure(api_key='YOUR_GEMINI_API_KEY')
-        self.model = genai.GenerativeModel('Gemini 2.0 Flash')
+    def __init__(self, model=None, question_cache: Optional[LLMCache] = None,
+                 feedback_cache: Optional[LLMCache] = None, client: Optional[GeminiClient] = None):
+        # All instances share one client unless a model or client is injected
+        if client is None:
+            client = GeminiClient(model=model) if model is not None else get_client()
+        self.client = client
+        if question_cache is None:
+            question_cache = LLMCache.shared(QUESTION_CACHE_FILE)
+        self.question_cache = question_cache
+        # One explanation per (question, chosen option); no need for a pool
+        if feedback_cache is None:
+            feedback_cache = LLMCache.shared(FEEDBACK_CACHE_FILE, max_entries=2000, pool_size=1)
+        self.feedback_cache = feedback_cache
 
     def generate_reading_questions(self, passage: str) -> List[Dict[str, Any]]:
         """
         Generate IELTS-style reading comprehension questions based on the given passage.
         
+        Question sets are cached per passage and prompt version, so only a
+        cache miss waits on the model.
+        
         Args:
             passage (str): The reading passage text
             
@@ -24,59 +64,105 @@ class GeminiQuizSystem:
                     "correct": str
                 }
         """
+        key = self._reading_cache_key(passage)
+        cached = self.question_cache.get(key)
+        if cached:
+            tracing.increment('gemini.question_cache.hit')
+            return cached
+        tracing.increment('gemini.question_cache.miss')
+
         try:
-            # Prompt engineering for Gemini to generate IELTS-style questions
-            prompt = f"""
-            Generate 5 IELTS reading comprehension questions based on this passage:
+            questions = self._request_reading_questions(passage)
+        except Exception as e:
+            print(f"Error generating reading questions: {str(e)}")
+            questions = None
 
-            {passage}
+        # Ensure we have at least some valid questions
+        if not questions:
+            return self._get_fallback_questions(passage)
 
-            Create questions that test different reading skills like:
-            - Main idea comprehension
-            - Detail identification
-            - Inference
-            - Vocabulary in context
-            - Purpose/tone understanding
+        self.question_cache.put(key, questions)
+        return questions
 
-            For each question:
-            - Include 4 plausible multiple choice options
-            - Ensure only one correct answer
-            - Make questions progressively more challenging
-            
-            Format the response as a JSON array with this structure:
-            [
-                {{
-                    "question": "The question text",
-                    "options": ["option1", "option2", "option3", "option4"],
-                    "correct": "correct option text"
-                }}
-            ]
-            
-            Only return the JSON array, no other text.
-            """
+    def pregenerate_reading_questions(self, passages: List[str], sets_per_passage: int = 3) -> int:
+        """
+        Fill the question cache with up to `sets_per_passage` sets for each passage.
+        
+        Returns:
+            int: Number of new question sets generated
+        """
+        wanted = min(sets_per_passage, self.question_cache.pool_size)
+        requests = []
+        for passage in passages:
+            missing = wanted - len(self.question_cache.get_pool(self._reading_cache_key(passage)))
+            requests.extend([passage] * max(missing, 0))
 
-            # Generate response from Gemini
-            response = self.model.generate_content(prompt)
-            
-            # Parse the response as JSON
-            questions = json.loads(response.text)
-            
-            # Validate the response format
-            validated_questions = []
-            for q in questions:
-                if self._validate_question_format(q):
-                    validated_questions.append(q)
-            
-            # Ensure we have at least some valid questions
-            if not validated_questions:
-                return self._get_fallback_questions(passage)
-                
-            return validated_questions
+        # Every missing set is requested in parallel through the shared client
+        responses = self.client.generate_many([self._reading_prompt(passage) for passage in requests])
 
-        except Exception as e:
-            print(f"Error generating reading questions: {str(e)}")
-            # Return fallback questions if there's an error
-            return self._get_fallback_questions(passage)
+        generated = 0
+        for passage, response in zip(requests, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                questions = self._parse_reading_questions(response)
+            except Exception as e:
+                print(f"Error generating reading questions: {str(e)}")
+                continue
+            if questions:
+                self.question_cache.put(self._reading_cache_key(passage), questions)
+                generated += 1
+        return generated
+
+    def _reading_cache_key(self, passage: str) -> str:
+        return content_key('reading', READING_PROMPT_VERSION, passage)
+
+    def _request_reading_questions(self, passage: str) -> List[Dict[str, Any]]:
+        """Ask the model for one question set and keep only well-formed questions."""
+        return self._parse_reading_questions(self.client.generate(self._reading_prompt(passage)))
+
+    def _reading_prompt(self, passage: str) -> str:
+        # Prompt engineering for Gemini to generate IELTS-style questions
+        return f"""
+        Generate 5 IELTS reading comprehension questions based on this passage:
+
+        {passage}
+
+        Create questions that test different reading skills like:
+        - Main idea comprehension
+        - Detail identification
+        - Inference
+        - Vocabulary in context
+        - Purpose/tone understanding
+
+        For each question:
+        - Include 4 plausible multiple choice options
+        - Ensure only one correct answer
+        - Make questions progressively more challenging
+        
+        Format the response as a JSON array with this structure:
+        [
+            {{
+                "question": "The question text",
+                "options": ["option1", "option2", "option3", "option4"],
+                "correct": "correct option text"
+            }}
+        ]
+        
+        Only return the JSON array, no other text.
+        """
+
+    def _parse_reading_questions(self, response_text: str) -> List[Dict[str, Any]]:
+        # Parse the response as JSON
+        questions = json.loads(response_text)
+        
+        # Validate the response format
+        validated_questions = []
+        for q in questions:
+            if self._validate_question_format(q):
+                validated_questions.append(q)
+            
+        return validated_questions
 
     def _validate_question_format(self, question: Dict) -> bool:
         """Validate that a question dictionary has the correct format."""
@@ -128,20 +214,80 @@ class GeminiQuizSystem:
             return sentences[0].strip() + '.'
         return "Main idea of the passage"
 
-    def evaluate_answer(self, question: str, user_answer: str, correct_answer: str) -> Dict[str, Any]:
+    def evaluate_answer(self, question: str, user_answer: str, correct_answer: str,
+                        feedback_mode: str = FEEDBACK_BACKGROUND) -> Dict[str, Any]:
         """
-        Evaluate a user's answer and provide feedback using Gemini.
+        Evaluate a user's answer and provide feedback.
+        
+        The verdict is always computed locally. How the explanation is obtained
+        depends on `feedback_mode`:
+            - "model": wait for Gemini before returning (the original behaviour)
+            - "cached": use a cached explanation if there is one, never call the model
+            - "background": like "cached", but on a miss start fetching the
+              explanation in the background; `refresh_feedback` picks it up later
         
         Args:
             question (str): The question text
             user_answer (str): The user's selected answer
             correct_answer (str): The correct answer
+            feedback_mode (str): One of "model", "cached" or "background"
             
         Returns:
-            Dict: Evaluation results with feedback
+            Dict: Evaluation results with feedback. "feedback_pending" is True
+            while a background explanation is still being generated.
         """
         is_correct = user_answer == correct_answer
-        
+        key = content_key('feedback', FEEDBACK_PROMPT_VERSION, question, user_answer, correct_answer)
+        evaluation = {
+            "is_correct": is_correct,
+            "feedback": "Your answer is " + ("correct!" if is_correct else "incorrect."),
+            "improvement_tips": "Review the passage carefully and try again.",
+            "score": 1 if is_correct else 0,
+            "feedback_key": key,
+            "feedback_pending": False
+        }
+
+        explanation = self.feedback_cache.get(key)
+        tracing.increment('gemini.feedback_cache.' + ('miss' if explanation is None else 'hit'))
+        if explanation is None and feedback_mode == FEEDBACK_MODEL:
+            explanation = self._fetch_feedback(key, question, user_answer, correct_answer)
+        elif explanation is None and feedback_mode == FEEDBACK_BACKGROUND:
+            future = None
+            with _pending_lock:
+                if key not in _pending_feedback:
+                    future = _pending_feedback[key] = _feedback_executor.submit(
+                        self._fetch_feedback, key, question, user_answer, correct_answer
+                    )
+            # Outside the lock: the callback runs at once if the fetch already finished
+            if future is not None:
+                future.add_done_callback(partial(_forget_feedback, key))
+            evaluation["feedback_pending"] = True
+
+        if explanation:
+            evaluation.update(explanation)
+        return evaluation
+
+    def refresh_feedback(self, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in a pending explanation if its background request has finished."""
+        if not evaluation.get("feedback_pending"):
+            return evaluation
+
+        key = evaluation["feedback_key"]
+        explanation = self.feedback_cache.get(key)
+        if explanation is None:
+            with _pending_lock:
+                future = _pending_feedback.get(key)
+            if future is not None and not future.done():
+                return evaluation
+            # Finished without caching anything: keep the local feedback
+
+        refreshed = dict(evaluation, feedback_pending=False)
+        if explanation:
+            refreshed.update(explanation)
+        return refreshed
+
+    def _fetch_feedback(self, key: str, question: str, user_answer: str, correct_answer: str) -> Optional[Dict[str, str]]:
+        """Ask the model to explain an answer and cache the explanation."""
         try:
             prompt = f"""
             Question: {question}
@@ -159,22 +305,17 @@ class GeminiQuizSystem:
             Only return the JSON object, no other text.
             """
             
-            response = self.model.generate_content(prompt)
-            feedback = json.loads(response.text)
+            feedback = json.loads(self.client.generate(prompt))
             
             # Ensure the feedback has the correct format
-            return {
-                "is_correct": is_correct,
+            is_correct = user_answer == correct_answer
+            explanation = {
                 "feedback": feedback.get("feedback", "Your answer is " + ("correct!" if is_correct else "incorrect.")),
-                "improvement_tips": feedback.get("improvement_tips", "Review the passage carefully."),
-                "score": 1 if is_correct else 0
+                "improvement_tips": feedback.get("improvement_tips", "Review the passage carefully.")
             }
+            self.feedback_cache.put(key, explanation)
+            return explanation
             
         except Exception as e:
             print(f"Error generating feedback: {str(e)}")
-            return {
-                "is_correct": is_correct,
-                "feedback": "Your answer is " + ("correct!" if is_correct else "incorrect."),
-                "improvement_tips": "Review the passage carefully and try again.",
-                "score": 1 if is_correct else 0
-            }
\ No newline at end of file
+            return None
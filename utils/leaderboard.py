@@ -0,0 +1,95 @@
+from datetime import datetime
+from utils.database import DB_PATH, get_connection, transaction, run_once
+from utils.progress_repository import ProgressRepository
+
+ALL_LANGUAGES = ''
+PERIODS = ['all', 'week', 'month']
+
+
+def period_key(period, when=None):
+    """Return the bucket key for a period ('all', 'week' or 'month') at a given time."""
+    when = when or datetime.now()
+    if period == 'all':
+        return 'all'
+    if period == 'week':
+        year, week, _ = when.isocalendar()
+        return f"week:{year}-W{week:02d}"
+    if period == 'month':
+        return f"month:{when:%Y-%m}"
+    raise ValueError(f"Unknown leaderboard period: {period}")
+
+
+class Leaderboard:
+    """Materialized leaderboard maintained incrementally on every saved attempt.
+
+    Each (language, period bucket, user) keeps a running score sum and attempt
+    count. The (language, period, average) index acts as the top-K structure:
+    reading the top 10 is an index range scan that does not depend on how many
+    attempts have ever been recorded. Undated attempts (imported from the
+    legacy workbook) only count towards the all-time buckets.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._create_schema()
+        ProgressRepository(db_path)  # Buckets are rebuilt from the progress log
+        run_once('rebuild_leaderboard', self._rebuild, db_path)
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS leaderboard_stats (
+                language TEXT NOT NULL,
+                period TEXT NOT NULL,
+                username TEXT NOT NULL,
+                score_sum REAL NOT NULL,
+                attempts INTEGER NOT NULL,
+                average REAL NOT NULL,
+                PRIMARY KEY (language, period, username)
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_leaderboard_rank "
+            "ON leaderboard_stats (language, period, average DESC)"
+        )
+
+    def _rebuild(self, conn):
+        """Recompute every bucket from the progress log."""
+        conn.execute("DELETE FROM leaderboard_stats")
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'progress'").fetchone():
+            return
+        rows = conn.execute("SELECT username, language, score, created_at FROM progress")
+        for row in rows:
+            when = datetime.fromisoformat(row['created_at']) if row['created_at'] else None
+            self._add(conn, row['username'], row['language'], row['score'], when)
+
+    def record(self, username, language, score, when=None):
+        """Fold one attempt into the all-time, weekly and monthly buckets."""
+        with transaction(self.db_path) as conn:
+            self._add(conn, username, language, score, when or datetime.now())
+
+    def _add(self, conn, username, language, score, when):
+        """Add an attempt made at `when`, or an undated one if `when` is None."""
+        periods = PERIODS if when is not None else ['all']
+        rows = [
+            (scope, period_key(period, when), username, float(score))
+            for scope in (ALL_LANGUAGES, language)
+            for period in periods
+        ]
+        conn.executemany("""
+            INSERT INTO leaderboard_stats (language, period, username, score_sum, attempts, average)
+            VALUES (?1, ?2, ?3, ?4, 1, ?4)
+            ON CONFLICT (language, period, username) DO UPDATE SET
+                score_sum = score_sum + excluded.score_sum,
+                attempts = attempts + 1,
+                average = (score_sum + excluded.score_sum) / (attempts + 1)
+        """, rows)
+
+    def top(self, language=None, period='all', limit=10):
+        """Return [(username, average score)] for the best users in a bucket."""
+        rows = get_connection(self.db_path).execute("""
+            SELECT username, average FROM leaderboard_stats
+            WHERE language = ? AND period = ?
+            ORDER BY average DESC LIMIT ?
+        """, (language or ALL_LANGUAGES, period_key(period), limit))
+        return [(row['username'], row['average']) for row in rows]
@@ -0,0 +1,104 @@
+from datetime import datetime
+from utils.database import DB_PATH, get_connection, transaction, run_once
+from utils.user_repository import note_version
+
+PURCHASE = 'purchase'
+STREAK_BONUS = 'streak_bonus'
+ACHIEVEMENT_AWARD = 'achievement'
+SIGNUP_BONUS = 'signup_bonus'
+OPENING_BALANCE = 'opening_balance'
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+class CoinLedger:
+    """Append-only record of every coin movement.
+
+    `users.coins` is the running balance and is only changed together with a
+    ledger entry, inside one transaction. The balance update is a conditional
+    `coins = coins + ?` on the user's row, so concurrent sessions never
+    overwrite each other's changes and a debit can never overdraw.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._create_schema()
+        run_once('ledger_opening_balances', self._record_opening_balances, db_path)
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        # Same layout as the transactions table already shipped in virtual_economy.db
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT,
+                item_id TEXT,
+                amount INTEGER,
+                transaction_type TEXT,
+                timestamp DATE DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transactions_user ON transactions (username, id)"
+        )
+
+    def _record_opening_balances(self, conn):
+        """Give balances that predate the ledger a matching opening entry."""
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'users'").fetchone():
+            return
+        conn.execute("""
+            INSERT INTO transactions (username, item_id, amount, transaction_type, timestamp)
+            SELECT u.username, NULL, u.coins - COALESCE(SUM(t.amount), 0), ?, ?
+            FROM users u LEFT JOIN transactions t ON t.username = u.username
+            GROUP BY u.username
+            HAVING u.coins - COALESCE(SUM(t.amount), 0) != 0
+        """, (OPENING_BALANCE, datetime.now().isoformat()))
+
+    def apply(self, username, amount, transaction_type, item_id=None):
+        """Credit (positive) or debit (negative) a user's coins atomically.
+
+        Returns the new balance. Raises InsufficientFunds if a debit would take
+        the balance below zero, or KeyError if the user does not exist.
+        """
+        with transaction(self.db_path) as conn:
+            row = conn.execute(
+                "UPDATE users SET coins = coins + ?, version = version + 1 "
+                "WHERE username = ? AND coins + ? >= 0 RETURNING coins, version",
+                (amount, username, amount)
+            ).fetchone()
+            if row is None:
+                if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+                    raise InsufficientFunds(username)
+                raise KeyError(username)
+            note_version(username, row['version'])
+
+            conn.execute(
+                "INSERT INTO transactions (username, item_id, amount, transaction_type, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (username, item_id, amount, transaction_type, datetime.now().isoformat())
+            )
+            return row['coins']
+
+    def credit(self, username, amount, transaction_type, item_id=None):
+        return self.apply(username, abs(amount), transaction_type, item_id)
+
+    def debit(self, username, amount, transaction_type, item_id=None):
+        return self.apply(username, -abs(amount), transaction_type, item_id)
+
+    def balance(self, username):
+        """Balance derived from the ledger alone (should equal users.coins)."""
+        row = get_connection(self.db_path).execute(
+            "SELECT COALESCE(SUM(amount), 0) AS balance FROM transactions WHERE username = ?",
+            (username,)
+        ).fetchone()
+        return row['balance']
+
+    def history(self, username, limit=20):
+        """Most recent ledger entries for a user, newest first."""
+        rows = get_connection(self.db_path).execute("""
+            SELECT item_id, amount, transaction_type, timestamp FROM transactions
+            WHERE username = ? ORDER BY id DESC LIMIT ?
+        """, (username, limit))
+        return [dict(row) for row in rows]
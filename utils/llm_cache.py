@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def content_key(*parts):
+    """Stable hash of the given parts, used to address cached model output."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).strip().encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """Content-addressed LRU cache for model responses, persisted as JSON.
+
+    Each key holds a small pool of values (e.g. several question sets for one
+    passage) so repeated quizzes on the same passage don't all look the same.
+    Entries expire after `ttl_seconds`; the least recently used keys are
+    evicted once more than `max_entries` are held.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path, max_entries=512, ttl_seconds=30 * 24 * 3600, pool_size=5):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.pool_size = pool_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def shared(cls, path, **kwargs):
+        """Return the process-wide cache for a file, creating it on first use."""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path, **kwargs)
+            return cls._shared[path]
+
+    def _load(self):
+        if not Path(self.path).exists():
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable cache file {self.path}: {str(e)}")
+            return
+        now = time.time()
+        for key, entry in sorted(entries.items(), key=lambda item: item[1]['used_at']):
+            if now - entry['created_at'] < self.ttl_seconds:
+                self._entries[key] = entry
+
+    def _save(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def _live_entry(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry['created_at'] >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get_pool(self, key):
+        """Return every cached value for a key (empty list on a miss)."""
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                return []
+            entry['used_at'] = time.time()
+            self._entries.move_to_end(key)
+            return list(entry['values'])
+
+    def get(self, key):
+        """Return one cached value for a key, picked at random from its pool."""
+        pool = self.get_pool(key)
+        return random.choice(pool) if pool else None
+
+    def put(self, key, value):
+        """Add a value to a key's pool, evicting the oldest values and keys."""
+        with self._lock:
+            now = time.time()
+            entry = self._live_entry(key)
+            if entry is None:
+                entry = {'created_at': now, 'used_at': now, 'values': []}
+                self._entries[key] = entry
+            entry['values'] = (entry['values'] + [value])[-self.pool_size:]
+            entry['used_at'] = now
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def __len__(self):
+        return len(self._entries)
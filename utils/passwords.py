@@ -0,0 +1,183 @@
+# utils/passwords.py
+"""Salted PBKDF2 password hashing and a short-lived verified-credential cache.
+
+Hashes are stored as `pbkdf2_sha256$<iterations>$<salt>$<hash>`. The work
+factor defaults to UIE_PASSWORD_ITERATIONS (600k, the current OWASP
+recommendation for PBKDF2-SHA256) and stored hashes are upgraded on the next
+successful login when it changes.
+
+Plaintext passwords from the users.xlsx era are hashed when the workbook is
+imported, and a one-shot startup migration hashes any still stored in the
+users table. Both run inside the first page load, so they use the cheaper
+MIGRATION_ITERATIONS and leave the full work factor to the login upgrade.
+`python -m utils.passwords migrate` hashes at full cost on demand.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+ALGORITHM = 'pbkdf2_sha256'
+DEFAULT_ITERATIONS = int(os.environ.get('UIE_PASSWORD_ITERATIONS', 600_000))
+# Interim cost for bulk hashing; needs_rehash flags these for upgrade at login
+MIGRATION_ITERATIONS = min(10_000, DEFAULT_ITERATIONS)
+SALT_BYTES = 16
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def hash_password(password, iterations=None):
+    """Return an encoded salted hash of `password`."""
+    iterations = iterations or DEFAULT_ITERATIONS
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac('sha256', str(password).encode('utf-8'), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def hash_passwords(passwords, iterations=None, workers=None):
+    """Hash many passwords on every core, in order."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    passwords = list(passwords)
+    if not passwords:
+        return []
+    # hashlib releases the GIL while hashing, so threads use every core
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(lambda password: hash_password(password, iterations), passwords))
+
+
+def is_hashed(stored):
+    return isinstance(stored, str) and stored.startswith(ALGORITHM + '$')
+
+
+def verify_password(password, stored):
+    """Check a password against a stored hash in constant time.
+
+    Plaintext values from before hashing was introduced are still accepted
+    (compared in constant time too) so those users can log in and be upgraded.
+    """
+    password = str(password)
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode('utf-8'), str(stored).encode('utf-8'))
+
+    try:
+        _, iterations, salt, expected = stored.split('$')
+        digest = hashlib.pbkdf2_hmac(
+            'sha256', password.encode('utf-8'), base64.b64decode(salt), int(iterations)
+        )
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(digest, base64.b64decode(expected))
+
+
+def needs_rehash(stored, iterations=None):
+    """True if the value is plaintext or was hashed with a different work factor."""
+    if not is_hashed(stored):
+        return True
+    return int(stored.split('$')[1]) != (iterations or DEFAULT_ITERATIONS)
+
+
+# Verified against when a username does not exist, so that path costs the same
+_DUMMY_HASHES = {}
+
+
+def dummy_verify(password, iterations=None):
+    iterations = iterations or DEFAULT_ITERATIONS
+    if iterations not in _DUMMY_HASHES:
+        _DUMMY_HASHES[iterations] = hash_password(secrets.token_hex(8), iterations)
+    verify_password(password, _DUMMY_HASHES[iterations])
+
+
+class VerifiedCredentialCache:
+    """Bounded, short-TTL memory of credentials that recently passed the KDF.
+
+    Entries are keyed by an HMAC of (username, password, stored hash) under a
+    per-process random secret, so no password is kept in memory and a
+    password change (new stored hash) never matches an old entry.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._secret = secrets.token_bytes(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, username, password, stored):
+        message = '\0'.join([str(username), str(password), str(stored)]).encode('utf-8')
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def contains(self, username, password, stored):
+        key = self._key(username, password, stored)
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, username, password, stored):
+        key = self._key(username, password, stored)
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl_seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def hash_plaintext_rows(conn, iterations=None, workers=None):
+    """Hash every plaintext password in the users table on `conn`. Returns the count.
+
+    Defaults to MIGRATION_ITERATIONS: this runs while the startup migration
+    holds the write lock.
+    """
+    iterations = iterations or MIGRATION_ITERATIONS
+    # A prefix comparison: in LIKE, the '_' of the algorithm name is a wildcard
+    rows = conn.execute(
+        "SELECT username, password FROM users WHERE substr(password, 1, ?) != ?",
+        (len(ALGORITHM) + 1, ALGORITHM + '$')
+    ).fetchall()
+    hashed = hash_passwords((row['password'] for row in rows), iterations, workers)
+    for row, new_hash in zip(rows, hashed):
+        # Skip rows whose password changed while we were hashing
+        conn.execute(
+            "UPDATE users SET password = ?, version = version + 1 "
+            "WHERE username = ? AND password = ?",
+            (new_hash, row['username'], row['password'])
+        )
+    return len(rows)
+
+
+def migrate_plaintext_passwords(iterations=None, workers=None):
+    """Hash every plaintext password in the users table at full cost. Returns the count."""
+    from utils.database import transaction
+    from utils.user_repository import UserRepository
+
+    users = UserRepository()
+    with transaction(users.db_path) as conn:
+        return hash_plaintext_rows(conn, iterations or DEFAULT_ITERATIONS, workers)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Password maintenance")
+    parser.add_argument('command', choices=['migrate'])
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    count = migrate_plaintext_passwords(args.iterations)
+    print(f"Hashed {count} plaintext passwords")
@@ -0,0 +1,96 @@
+from datetime import datetime
+from pathlib import Path
+from utils.database import DB_PATH, get_connection, transaction, run_once
+from utils.excel_reader import iter_chunks
+
+PROGRESS_COLUMNS = ['username', 'language', 'module', 'score', 'completed', 'created_at']
+
+
+class ProgressRepository:
+    """Append-only log of quiz attempts.
+
+    Each attempt is one inserted row; reads go through the (username, language)
+    index, so neither path depends on how many attempts have been recorded.
+    Attempts may carry an `attempt_id` idempotency key: the unique index on it
+    makes a repeated write of the same attempt a no-op.
+    """
+
+    def __init__(self, db_path=DB_PATH, legacy_file="data/progress.xlsx"):
+        self.db_path = db_path
+        self.legacy_file = legacy_file
+        self._create_schema()
+        run_once('import_progress_xlsx', self._import_legacy_progress, db_path)
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS progress (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                language TEXT NOT NULL,
+                module TEXT,
+                score REAL NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 1,
+                created_at TEXT,
+                attempt_id TEXT
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_progress_user_language "
+            "ON progress (username, language)"
+        )
+        # Legacy rows have no attempt id; SQLite lets any number of NULLs share a unique index
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_progress_attempt ON progress (attempt_id)")
+
+    def _import_legacy_progress(self, conn):
+        """One-shot copy of the legacy progress.xlsx rows into the progress table."""
+        if not Path(self.legacy_file).exists():
+            return
+
+        count = 0
+        for chunk in iter_chunks(self.legacy_file):
+            rows = [
+                (
+                    str(record['username']),
+                    str(record['language']),
+                    None if record.get('module') is None else str(record['module']),
+                    float(record['score']),
+                    0 if record.get('completed') is False else 1,
+                    # The workbook does not record when attempts were made
+                    None
+                )
+                for record in chunk
+                if record.get('username') is not None and record.get('score') is not None
+            ]
+            conn.executemany(
+                f"INSERT INTO progress ({', '.join(PROGRESS_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(PROGRESS_COLUMNS))})",
+                rows
+            )
+            count += len(rows)
+        print(f"Imported {count} progress rows from {self.legacy_file}")
+
+    def append(self, username, language, module, score, completed=True, when=None, attempt_id=None):
+        """Record one attempt and return its row id.
+
+        Returns None without writing if `attempt_id` has already been recorded.
+        """
+        with transaction(self.db_path) as conn:
+            cursor = conn.execute(
+                f"INSERT INTO progress ({', '.join(PROGRESS_COLUMNS)}, attempt_id) "
+                f"VALUES ({', '.join('?' * (len(PROGRESS_COLUMNS) + 1))}) "
+                f"ON CONFLICT (attempt_id) DO NOTHING",
+                (username, language, module, float(score), 1 if completed else 0,
+                 (when or datetime.now()).isoformat(), attempt_id)
+            )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def get_user_rows(self, username, language=None):
+        """Return the user's attempts, oldest first, optionally for one language."""
+        conn = get_connection(self.db_path)
+        query = f"SELECT {', '.join(PROGRESS_COLUMNS)} FROM progress WHERE username = ?"
+        params = [username]
+        if language is not None:
+            query += " AND language = ?"
+            params.append(language)
+        return [dict(row) for row in conn.execute(query + " ORDER BY id", params)]
@@ -0,0 +1,150 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from utils.database import DB_PATH, get_connection, transaction, run_once
+
+RECENT_SIZE = 5
+
+
+@dataclass(slots=True)
+class ModuleStats:
+    attempts: int = 0
+    score_sum: float = 0.0
+    best: float = 0.0
+    last_score: Optional[float] = None
+    last_at: Optional[str] = None
+
+    @property
+    def average(self):
+        return self.score_sum / self.attempts if self.attempts else 0.0
+
+    def merge(self, other):
+        self.attempts += other.attempts
+        self.score_sum += other.score_sum
+        self.best = max(self.best, other.best)
+        if self.last_at is None or (other.last_at or '') > self.last_at:
+            self.last_score, self.last_at = other.last_score, other.last_at
+
+
+@dataclass(slots=True)
+class ProgressSummary:
+    """Everything the dashboard shows about a user's progress."""
+    modules: Dict[Tuple[str, str], ModuleStats] = field(default_factory=dict)
+    recent: List[dict] = field(default_factory=list)
+
+    def language(self, language):
+        """Stats across every module of one language."""
+        total = ModuleStats()
+        for (module_language, _), stats in self.modules.items():
+            if module_language == language:
+                total.merge(stats)
+        return total
+
+    def overall(self):
+        total = ModuleStats()
+        for stats in self.modules.values():
+            total.merge(stats)
+        return total
+
+
+class ProgressSummaries:
+    """Per-(user, language, module) aggregates kept current on every saved attempt.
+
+    `progress_stats` holds attempt count, score sum, best and last score per
+    module; `progress_recent` is a ring buffer of each user's last RECENT_SIZE
+    attempts, keyed by (username, slot). Both are read by primary-key prefix,
+    so a dashboard render costs the same however long the progress log grows.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._create_schema()
+        run_once('rebuild_progress_summary', self._rebuild, db_path)
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS progress_stats (
+                username TEXT NOT NULL,
+                language TEXT NOT NULL,
+                module TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                score_sum REAL NOT NULL,
+                best REAL NOT NULL,
+                last_score REAL,
+                last_at TEXT,
+                PRIMARY KEY (username, language, module)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS progress_recent (
+                username TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                module TEXT,
+                score REAL NOT NULL,
+                created_at TEXT,
+                PRIMARY KEY (username, slot)
+            )
+        """)
+
+    def _rebuild(self, conn):
+        """Recompute the aggregates and ring buffers from the progress log."""
+        conn.execute("DELETE FROM progress_stats")
+        conn.execute("DELETE FROM progress_recent")
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'progress'").fetchone():
+            return
+        rows = conn.execute(
+            "SELECT username, language, module, score, created_at FROM progress ORDER BY id"
+        )
+        for row in rows:
+            self._add(conn, row['username'], row['language'], row['module'],
+                      row['score'], row['created_at'])
+
+    def record(self, username, language, module, score, when=None):
+        """Fold one attempt into the user's module stats and recent activity."""
+        with transaction(self.db_path) as conn:
+            self._add(conn, username, language, module, score,
+                      (when or datetime.now()).isoformat())
+
+    def _add(self, conn, username, language, module, score, created_at):
+        score = float(score)
+        conn.execute("""
+            INSERT INTO progress_stats
+                (username, language, module, attempts, score_sum, best, last_score, last_at)
+            VALUES (?1, ?2, ?3, 1, ?4, ?4, ?4, ?5)
+            ON CONFLICT (username, language, module) DO UPDATE SET
+                attempts = attempts + 1,
+                score_sum = score_sum + excluded.score_sum,
+                best = MAX(best, excluded.best),
+                last_score = excluded.last_score,
+                last_at = excluded.last_at
+        """, (username, language, module or '', score, created_at))
+
+        seq = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM progress_recent WHERE username = ?",
+            (username,)
+        ).fetchone()[0]
+        conn.execute("""
+            INSERT OR REPLACE INTO progress_recent
+                (username, slot, seq, language, module, score, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (username, seq % RECENT_SIZE, seq, language, module, score, created_at))
+
+    def get(self, username):
+        """Return the user's ProgressSummary."""
+        conn = get_connection(self.db_path)
+        modules = {
+            (row['language'], row['module']): ModuleStats(
+                row['attempts'], row['score_sum'], row['best'], row['last_score'], row['last_at']
+            )
+            for row in conn.execute("SELECT * FROM progress_stats WHERE username = ?", (username,))
+        }
+        recent = [
+            dict(row) for row in conn.execute("""
+                SELECT language, module, score, created_at FROM progress_recent
+                WHERE username = ? ORDER BY seq
+            """, (username,))
+        ]
+        return ProgressSummary(modules, recent)
@@ -0,0 +1,98 @@
+# utils/quiz_session.py
+"""State of one quiz attempt, kept in st.session_state from Start Quiz to completion.
+
+Everything a quiz needs is fixed when it starts: the passage, the
+questions with their answer key, and the student's ability for adaptive
+banks. Submitting an answer is a pure in-memory transition, so a rerun
+during a quiz does no database or model calls. The attempt is written out
+once when the last answer is in (see pages/quiz.py), keyed by `attempt_id`
+so that saving the same attempt again changes nothing.
+"""
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+@dataclass(slots=True)
+class QuizSession:
+    language: str
+    module: str
+    questions: List[dict]
+    passage: Optional[dict] = None
+    # Ability estimate and answer count at the start, for adaptive bank quizzes
+    theta: Optional[float] = None
+    ability_attempts: int = 0
+    started_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    # (selected option, is_correct) per answered question
+    answers: List[Tuple[str, bool]] = field(default_factory=list)
+    # Evaluation per answered question; pages/quiz.py requests each explanation
+    # when the answer is submitted, so it is usually ready by the results screen
+    feedback: List[dict] = field(default_factory=list)
+    earned: List[str] = field(default_factory=list)
+    saved: bool = False
+    attempt_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @property
+    def adaptive(self):
+        return self.theta is not None
+
+    @property
+    def position(self):
+        """Index of the question being asked."""
+        return len(self.answers)
+
+    @property
+    def question(self):
+        return self.questions[self.position]
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    @property
+    def correct(self):
+        return sum(1 for _, is_correct in self.answers if is_correct)
+
+    @property
+    def final_score(self):
+        return self.correct / len(self.questions) * 100 if self.questions else 0.0
+
+    @property
+    def duration(self):
+        return (self.finished_at or datetime.now()) - self.started_at
+
+    def submit(self, answer, selector=None, username=None):
+        """Grade the current question against the answer key and move on.
+
+        With a `selector`, adaptive quizzes re-rank the unanswered questions
+        for the ability implied by the answers so far (in memory, no writes).
+        Returns whether the answer was correct.
+        """
+        question = self.question
+        is_correct = answer == question['correct']
+        self.answers.append((answer, is_correct))
+
+        if self.adaptive and selector is not None and 'id' in question:
+            self.theta = selector.estimate(
+                self.language, self.theta, self.ability_attempts + len(self.answers) - 1,
+                question['id'], is_correct
+            )
+            asked = self.questions[:self.position]
+            self.questions = asked + selector.select(
+                username, self.language, len(self.questions) - len(asked),
+                exclude=[q['id'] for q in asked if 'id' in q], theta=self.theta
+            )
+
+        if self.position >= len(self.questions):
+            self.finished_at = datetime.now()
+        return is_correct
+
+    def bank_answers(self):
+        """(item_id, correct) for every answered bank question, in order."""
+        return [
+            (question['id'], is_correct)
+            for question, (_, is_correct) in zip(self.questions, self.answers)
+            if 'id' in question
+        ]
@@ -0,0 +1,171 @@
+# utils/review_scheduler.py
+"""Spaced-repetition reviews of answered questions (SM-2).
+
+Every answered question gets a row in `review_items` with its SM-2 state
+(ease, interval, repetitions) and the time it is next due. A wrong answer
+brings the item back after a short relearning delay; each correct review
+pushes it further out.
+
+Due items are served from a per-user min-heap ordered by due time, so
+taking the next due item is O(log n) and never scans the user's history.
+"""
+import heapq
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from utils.database import DB_PATH, get_connection, transaction
+from utils.llm_cache import content_key
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+MAX_INTERVAL_DAYS = 365
+RELEARN_DELAY = timedelta(minutes=10)
+CORRECT_QUALITY = 4
+WRONG_QUALITY = 1
+MAX_CACHED_QUEUES = 1024
+
+
+def item_id_for(question):
+    """Bank questions keep their id; generated ones are keyed by content."""
+    return question.get('id') or 'gen-' + content_key(question['question'], question['correct'])[:24]
+
+
+def sm2(ease, interval, repetitions, quality):
+    """Return (ease, interval in days, repetitions) after a review of `quality` 0-5."""
+    if quality < 3:
+        return max(MIN_EASE, ease - 0.2), 0.0, 0
+    repetitions += 1
+    if repetitions == 1:
+        interval = 1.0
+    elif repetitions == 2:
+        interval = 6.0
+    else:
+        interval = min(MAX_INTERVAL_DAYS, interval * ease)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return ease, interval, repetitions
+
+
+def due_time(last_reviewed, interval):
+    """When an item reviewed at `last_reviewed` with `interval` days is due again."""
+    return last_reviewed + (timedelta(days=interval) if interval else RELEARN_DELAY)
+
+
+class ReviewQueue:
+    """Min-heap of (due time, item id) for one user.
+
+    Rescheduling pushes a new entry and leaves the old one in place; stale
+    entries are recognised against `due` and dropped when they surface.
+    """
+
+    def __init__(self, rows):
+        self.due = {row['item_id']: row['due_at'] for row in rows}
+        self.heap = [(due_at, item_id) for item_id, due_at in self.due.items()]
+        heapq.heapify(self.heap)
+        self.lock = threading.Lock()
+
+    def push(self, item_id, due_at):
+        with self.lock:
+            if self.due.get(item_id) == due_at:
+                return
+            self.due[item_id] = due_at
+            heapq.heappush(self.heap, (due_at, item_id))
+
+    def peek_due(self, now, limit):
+        """Up to `limit` item ids due at `now`, soonest first (the queue is unchanged)."""
+        taken = []
+        with self.lock:
+            while self.heap and len(taken) < limit and self.heap[0][0] <= now:
+                due_at, item_id = heapq.heappop(self.heap)
+                if self.due.get(item_id) == due_at and (not taken or taken[-1] != (due_at, item_id)):
+                    taken.append((due_at, item_id))
+            for entry in taken:
+                heapq.heappush(self.heap, entry)
+        return [item_id for _, item_id in taken]
+
+
+class ReviewScheduler:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._queues = OrderedDict()
+        self._lock = threading.Lock()
+        self._create_schema()
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS review_items (
+                username TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                question TEXT NOT NULL,
+                ease REAL NOT NULL,
+                interval_days REAL NOT NULL,
+                repetitions INTEGER NOT NULL,
+                lapses INTEGER NOT NULL DEFAULT 0,
+                last_reviewed TEXT NOT NULL,
+                due_at TEXT NOT NULL,
+                PRIMARY KEY (username, item_id)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_review_due ON review_items (username, due_at)")
+
+    def _queue(self, username):
+        with self._lock:
+            queue = self._queues.get(username)
+            if queue is not None:
+                self._queues.move_to_end(username)
+                return queue
+        rows = get_connection(self.db_path).execute(
+            "SELECT item_id, due_at FROM review_items WHERE username = ?", (username,)
+        ).fetchall()
+        with self._lock:
+            queue = self._queues.setdefault(username, ReviewQueue(rows))
+            while len(self._queues) > MAX_CACHED_QUEUES:
+                self._queues.popitem(last=False)
+        return queue
+
+    def record(self, username, language, question, correct, when=None):
+        """Schedule the next review of a question after the user answered it."""
+        when = when or datetime.now()
+        item_id = item_id_for(question)
+        quality = CORRECT_QUALITY if correct else WRONG_QUALITY
+
+        with transaction(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT ease, interval_days, repetitions FROM review_items "
+                "WHERE username = ? AND item_id = ?",
+                (username, item_id)
+            ).fetchone()
+            state = (row['ease'], row['interval_days'], row['repetitions']) if row else (DEFAULT_EASE, 0.0, 0)
+            ease, interval, repetitions = sm2(*state, quality)
+            due_at = due_time(when, interval).isoformat(timespec='seconds')
+            conn.execute("""
+                INSERT INTO review_items (username, item_id, language, question, ease, interval_days,
+                                          repetitions, lapses, last_reviewed, due_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (username, item_id) DO UPDATE SET
+                    ease = excluded.ease,
+                    interval_days = excluded.interval_days,
+                    repetitions = excluded.repetitions,
+                    lapses = lapses + excluded.lapses,
+                    last_reviewed = excluded.last_reviewed,
+                    due_at = excluded.due_at
+            """, (username, item_id, language, json.dumps(question, ensure_ascii=False), ease, interval,
+                  repetitions, 0 if correct else 1, when.isoformat(timespec='seconds'), due_at))
+        self._queue(username).push(item_id, due_at)
+        return due_at
+
+    def due(self, username, limit=10, now=None):
+        """The user's due questions, soonest first, as dicts with a 'language' key."""
+        now = (now or datetime.now()).isoformat(timespec='seconds')
+        item_ids = self._queue(username).peek_due(now, limit)
+        if not item_ids:
+            return []
+        rows = get_connection(self.db_path).execute(
+            f"SELECT item_id, language, question FROM review_items "
+            f"WHERE username = ? AND item_id IN ({', '.join('?' * len(item_ids))})",
+            [username, *item_ids]
+        )
+        by_id = {row['item_id']: dict(json.loads(row['question']), language=row['language']) for row in rows}
+        return [by_id[item_id] for item_id in item_ids if item_id in by_id]
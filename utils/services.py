@@ -0,0 +1,57 @@
+# utils/services.py
+"""Process-wide service objects shared by every page and session.
+
+Each getter builds its service once per process via st.cache_resource, and
+imports the backing module only on first use, so a page pays only for the
+services it actually touches (e.g. the login screen never loads pandas or
+the Gemini SDK).
+"""
+import streamlit as st
+
+
+@st.cache_resource
+def get_auth():
+    from utils.auth import Auth
+    return Auth()
+
+
+@st.cache_resource
+def get_data_manager():
+    from utils.data_manager import DataManager
+    return DataManager()
+
+
+@st.cache_resource
+def get_gamification():
+    from utils.gamification import GamificationSystem
+    return GamificationSystem()
+
+
+@st.cache_resource
+def get_economy():
+    from utils.virtual_economy import VirtualEconomy
+    return VirtualEconomy()
+
+
+@st.cache_resource
+def get_quiz_system():
+    from utils.gemini_helper import GeminiQuizSystem
+    return GeminiQuizSystem()
+
+
+@st.cache_resource
+def get_content():
+    from utils.content_repository import ContentRepository
+    return ContentRepository()
+
+
+@st.cache_resource
+def get_selector():
+    from utils.adaptive import AdaptiveSelector
+    return AdaptiveSelector(get_content())
+
+
+@st.cache_resource
+def get_scheduler():
+    from utils.review_scheduler import ReviewScheduler
+    return ReviewScheduler()
@@ -0,0 +1,22 @@
+# utils/session.py
+import streamlit as st
+from utils.services import get_auth
+
+
+def require_login():
+    """
+    Stop the page unless the session holds a valid token.
+    
+    Returns the user snapshot carried by the token ({'username', 'level',
+    'version', ...}). The user store is only read when the user's row has
+    changed since the token was issued.
+    """
+    snapshot, token = get_auth().resolve_session(st.session_state.get('session_token'))
+    if snapshot is None:
+        st.session_state.logged_in = False
+        st.error("Please log in first")
+        st.stop()
+
+    st.session_state.session_token = token
+    st.session_state.username = snapshot['username']
+    return snapshot
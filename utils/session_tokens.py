@@ -0,0 +1,63 @@
+# utils/session_tokens.py
+"""Signed session tokens carrying an immutable snapshot of the user.
+
+A token is `<base64 payload>.<base64 HMAC-SHA256 signature>`, where the
+payload holds the username, level, row version and expiry. Verifying one is
+pure in-memory work; callers compare the version with the latest one known
+to the process to decide whether the snapshot is still current.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+
+# Shared by every SessionTokens instance so any Auth object can verify a token.
+# Without UIE_SESSION_SECRET, tokens are only valid for the current process.
+_DEFAULT_SECRET = os.environ.get('UIE_SESSION_SECRET') or secrets.token_hex(32)
+
+
+def _encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class SessionTokens:
+    def __init__(self, secret=None, ttl_seconds=12 * 3600):
+        secret = secret or _DEFAULT_SECRET
+        self._secret = secret.encode('utf-8')
+        self.ttl_seconds = ttl_seconds
+
+    def _sign(self, payload):
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+    def issue(self, user):
+        """Return a token for a UserRecord."""
+        payload = json.dumps({
+            'username': user.username,
+            'level': int(user.level),
+            'version': int(user.version),
+            'expires_at': int(time.time()) + self.ttl_seconds
+        }, separators=(',', ':')).encode('utf-8')
+        return f"{_encode(payload)}.{_encode(self._sign(payload))}"
+
+    def verify(self, token):
+        """Return the token's snapshot, or None if it is forged, malformed or expired."""
+        try:
+            payload_text, signature_text = token.split('.')
+            payload = _decode(payload_text)
+            signature = _decode(signature_text)
+        except (AttributeError, ValueError):
+            return None
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+
+        snapshot = json.loads(payload)
+        if snapshot['expires_at'] < time.time():
+            return None
+        return snapshot
@@ -0,0 +1,165 @@
+# utils/streaks.py
+"""Daily streaks, settled for every user at once by a rollover after midnight.
+
+`users.last_login` holds the last day (ISO date) each user was active and is
+indexed, so a page view only has to move that date forward, which is a
+no-op once it already says today. Streaks and their coin bonuses are
+settled by the rollover. For every day that has ended, users active that
+day extend their streak and get the bonus, and users who missed it drop
+back to zero. Each step is one set-based statement over the index rather
+than a per-user read-modify-write.
+
+The rollover runs on the first streak check after midnight, and can also be
+scheduled (e.g. from cron at 00:00):
+
+    python -m utils.streaks rollover
+"""
+from datetime import date, datetime, timedelta
+from utils.database import DB_PATH, get_connection, transaction, run_once
+from utils.ledger import STREAK_BONUS
+from utils.achievements import STREAK_UPDATED
+from utils.user_model import ACHIEVEMENT_BITS
+from utils.user_repository import note_version
+
+BONUS_PER_DAY = 10
+MAX_BONUS = 100
+
+
+class DailyStreaks:
+    def __init__(self, achievements, db_path=DB_PATH):
+        self.achievements = achievements
+        self.db_path = db_path
+        self._rolled_through = None
+        self._create_schema()
+        run_once('streak_rollover_baseline', self._baseline, db_path)
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_users_last_login ON users (last_login)")
+        # Users whose streak the old per-visit check already extended for a day
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS streak_precredited (
+                day TEXT NOT NULL,
+                username TEXT NOT NULL,
+                PRIMARY KEY (day, username)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS streak_rollovers (
+                day TEXT PRIMARY KEY,
+                extended INTEGER NOT NULL,
+                reset INTEGER NOT NULL,
+                rolled_at TEXT NOT NULL
+            )
+        """)
+
+    def _baseline(self, conn):
+        """Switch over from per-visit streak updates.
+
+        Streaks so far were extended on each day's first visit, so every day
+        before today is settled, and so is today for users who have already
+        visited: the first rollover leaves those alone. Timestamps from the
+        old workbook are cut down to their date so the day index matches them.
+        """
+        today = date.today()
+        conn.execute("UPDATE users SET last_login = substr(last_login, 1, 10) WHERE length(last_login) > 10")
+        conn.execute(
+            "INSERT INTO streak_precredited (day, username) SELECT ?, username FROM users WHERE last_login = ?",
+            (today.isoformat(), today.isoformat())
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO streak_rollovers (day, extended, reset, rolled_at) VALUES (?, 0, 0, ?)",
+            ((today - timedelta(days=1)).isoformat(), datetime.now().isoformat())
+        )
+
+    def catch_up(self, today=None):
+        """Roll over every ended day not settled yet. Returns the days rolled.
+
+        Once up to date this is a date comparison in memory, so it is cheap
+        enough to call on every request.
+        """
+        yesterday = (today or date.today()) - timedelta(days=1)
+        if self._rolled_through is not None and self._rolled_through >= yesterday:
+            return 0
+
+        last = get_connection(self.db_path).execute("SELECT MAX(day) FROM streak_rollovers").fetchone()[0]
+        if last and date.fromisoformat(last) >= yesterday:
+            self._rolled_through = yesterday
+            return 0
+
+        rolled = 0
+        with transaction(self.db_path) as conn:
+            # Re-read under the write lock in case another session rolled first
+            last = conn.execute("SELECT MAX(day) FROM streak_rollovers").fetchone()[0]
+            day = date.fromisoformat(last) + timedelta(days=1) if last else yesterday
+            while day <= yesterday:
+                self._roll(conn, day)
+                day += timedelta(days=1)
+                rolled += 1
+        self._rolled_through = yesterday
+        return rolled
+
+    def _roll(self, conn, day):
+        """Settle one ended day for every user."""
+        day = day.isoformat()
+        now = datetime.now().isoformat()
+        active = "last_login = ?1 AND username NOT IN (SELECT username FROM streak_precredited WHERE day = ?1)"
+
+        # Old streak values on the right-hand side: the bonus is for the new length
+        extended = conn.execute(f"""
+            UPDATE users SET
+                streak = streak + 1,
+                coins = coins + MIN((streak + 1) * ?2, ?3),
+                version = version + 1
+            WHERE {active}
+            RETURNING username, streak, achievement_bits, version
+        """, (day, BONUS_PER_DAY, MAX_BONUS)).fetchall()
+        conn.execute(f"""
+            INSERT INTO transactions (username, item_id, amount, transaction_type, timestamp)
+            SELECT username, NULL, MIN(streak * ?2, ?3), ?4, ?5 FROM users WHERE {active}
+        """, (day, BONUS_PER_DAY, MAX_BONUS, STREAK_BONUS, now))
+        conn.execute(f"""
+            INSERT INTO achievement_counters (username, counter, value)
+            SELECT username, 'best_streak', streak FROM users WHERE {active}
+            ON CONFLICT (username, counter) DO UPDATE SET value = MAX(value, excluded.value)
+        """, (day,))
+        conn.execute("DELETE FROM streak_precredited WHERE day <= ?", (day,))
+
+        reset = conn.execute("""
+            UPDATE users SET streak = 0, version = version + 1
+            WHERE streak > 0 AND (last_login < ? OR last_login IS NULL)
+            RETURNING username, version
+        """, (day,)).fetchall()
+
+        for row in (*extended, *reset):
+            note_version(row['username'], row['version'])
+
+        # Only users who just reached a streak milestone go through the engine
+        rules = self.achievements.rules_by_event[STREAK_UPDATED]
+        for row in extended:
+            earned = [rule.achievement for rule in rules
+                      if row['streak'] >= rule.threshold
+                      and not row['achievement_bits'] & ACHIEVEMENT_BITS[rule.achievement]]
+            if earned:
+                self.achievements.award(row['username'], earned)
+
+        conn.execute(
+            "INSERT INTO streak_rollovers (day, extended, reset, rolled_at) VALUES (?, ?, ?, ?)",
+            (day, len(extended), len(reset), now)
+        )
+        print(f"Streak rollover for {day}: {len(extended)} extended, {len(reset)} reset")
+
+
+if __name__ == "__main__":
+    import argparse
+    from utils.achievements import AchievementEngine
+    from utils.ledger import CoinLedger
+    from utils.user_repository import UserRepository
+
+    parser = argparse.ArgumentParser(description="Daily streak maintenance")
+    parser.add_argument('command', choices=['rollover'])
+    args = parser.parse_args()
+
+    users = UserRepository()
+    streaks = DailyStreaks(AchievementEngine(users, CoinLedger()))
+    print(f"Rolled over {streaks.catch_up()} day(s)")
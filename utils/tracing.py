@@ -0,0 +1,177 @@
+# utils/tracing.py
+"""Lightweight timers and counters for the service layer.
+
+Set UIE_TRACING=1 to enable. When it is off, `instrument` hands classes back
+untouched and `span`/`increment` return immediately, so production code pays
+nothing. Collected metrics can be read with `snapshot()` or exported in the
+Prometheus text format with `render_prometheus()`.
+"""
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get('UIE_TRACING', '').lower() in ('1', 'true', 'yes')
+
+# Upper bounds in milliseconds; the last bucket catches everything slower
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+_lock = threading.Lock()
+_timers = {}
+_counters = {}
+
+
+class _Timer:
+    __slots__ = ('count', 'errors', 'total_ms', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def observe(self, elapsed_ms, failed):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if failed:
+            self.errors += 1
+        for index, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                break
+
+    def quantile(self, q):
+        """Estimate a latency quantile (ms) from the bucket counts."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, hits in zip(BUCKETS_MS, self.buckets):
+            if hits and seen + hits >= rank:
+                if bound == float('inf'):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / hits
+            seen += hits
+            lower = bound if bound != float('inf') else lower
+        return lower
+
+
+def _record(name, elapsed_ms, failed):
+    with _lock:
+        timer = _timers.get(name)
+        if timer is None:
+            timer = _timers[name] = _Timer()
+        timer.observe(elapsed_ms, failed)
+
+
+@contextmanager
+def span(name):
+    """Time a block of code under `name`."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _record(name, (time.perf_counter() - start) * 1000, failed)
+
+
+def increment(name, amount=1):
+    """Add to a named counter (cache hits, backend reads, login outcomes...)."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def traced(name):
+    """Decorator form of `span` for functions and coroutine functions."""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument(prefix):
+    """Class decorator that times every public method as `<prefix>.<method>`."""
+    def decorator(cls):
+        if not ENABLED:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_') or not inspect.isfunction(value):
+                continue
+            setattr(cls, attr, traced(f"{prefix}.{attr}")(value))
+        return cls
+    return decorator
+
+
+def snapshot():
+    """Return {'timers': {...}, 'counters': {...}} for the collected metrics."""
+    with _lock:
+        timers = {
+            name: {
+                'count': timer.count,
+                'errors': timer.errors,
+                'mean_ms': timer.total_ms / timer.count if timer.count else 0.0,
+                'p50_ms': timer.quantile(0.5),
+                'p99_ms': timer.quantile(0.99),
+                'total_ms': timer.total_ms
+            }
+            for name, timer in sorted(_timers.items())
+        }
+        return {'timers': timers, 'counters': dict(sorted(_counters.items()))}
+
+
+def render_prometheus():
+    """Export the metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP uie_operation_duration_seconds Latency of instrumented operations.",
+        "# TYPE uie_operation_duration_seconds histogram"
+    ]
+    with _lock:
+        for name, timer in sorted(_timers.items()):
+            cumulative = 0
+            for bound, hits in zip(BUCKETS_MS, timer.buckets):
+                cumulative += hits
+                le = '+Inf' if bound == float('inf') else repr(bound / 1000)
+                lines.append(f'uie_operation_duration_seconds_bucket{{operation="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'uie_operation_duration_seconds_sum{{operation="{name}"}} {timer.total_ms / 1000}')
+            lines.append(f'uie_operation_duration_seconds_count{{operation="{name}"}} {timer.count}')
+
+        lines.append("# HELP uie_operation_errors_total Instrumented calls that raised.")
+        lines.append("# TYPE uie_operation_errors_total counter")
+        for name, timer in sorted(_timers.items()):
+            lines.append(f'uie_operation_errors_total{{operation="{name}"}} {timer.errors}')
+
+        lines.append("# HELP uie_events_total Named event counters.")
+        lines.append("# TYPE uie_events_total counter")
+        for name, value in sorted(_counters.items()):
+            lines.append(f'uie_events_total{{event="{name}"}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
@@ -0,0 +1,78 @@
+from utils import tracing
+from utils.user_repository import known_version
+
+
+class UserContext:
+    """The logged-in user's data for a single page render.
+
+    Pages build one context at the top of each rerun and hand it to every
+    widget that needs the user record, progress or inventory, so each store is
+    read at most once per render. `reads` counts the backend reads made.
+
+    If a `cache` mapping (normally st.session_state) is given, the user record
+    is kept there between reruns and reused for as long as the row's version
+    is unchanged, so most renders don't read the user store at all.
+    """
+
+    def __init__(self, username, auth, data_manager, cache=None):
+        self.username = username
+        self.auth = auth
+        self.data_manager = data_manager
+        self.cache = cache
+        self.reads = 0
+        self._user = None
+        self._progress = None
+        self._summary = None
+
+    @property
+    def user(self):
+        if self._user is None:
+            cached = self.cache.get('cached_user') if self.cache is not None else None
+            if (cached and cached.username == self.username
+                    and cached.version == known_version(self.username)):
+                self._user = cached
+                return self._user
+
+            self._user = self.auth.get_user_data(self.username)
+            self.reads += 1
+            tracing.increment('user_context.reads')
+            if self.cache is not None and self._user:
+                self.cache['cached_user'] = self._user
+        return self._user
+
+    @property
+    def progress(self):
+        if self._progress is None:
+            self._progress = self.data_manager.get_user_progress(self.username)
+            self.reads += 1
+            tracing.increment('user_context.reads')
+        return self._progress
+
+    @property
+    def summary(self):
+        """Precomputed progress aggregates; prefer this over `progress` for stats."""
+        if self._summary is None:
+            self._summary = self.data_manager.get_progress_summary(self.username)
+            self.reads += 1
+            tracing.increment('user_context.reads')
+        return self._summary
+
+    @property
+    def inventory(self):
+        return self.user.inventory if self.user else []
+
+    @property
+    def achievements(self):
+        return self.user.achievements if self.user else []
+
+    def check_daily_streak(self, economy):
+        """Run the daily streak check against the already loaded record."""
+        if not self.user:
+            return 0
+        return economy.check_daily_streak(self.username, user_data=self.user)
+
+    def invalidate(self):
+        """Drop cached data after a write so the next access reloads it."""
+        self._user = None
+        self._progress = None
+        self._summary = None
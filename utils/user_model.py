@@ -0,0 +1,69 @@
+# utils/user_model.py
+"""Typed in-memory user records.
+
+Achievements are stored as a bitset (`users.achievement_bits`) and purchased
+items as rows in `user_inventory`, so a record is built once per load and
+"has achievement X" / "owns item Y" are O(1) checks with no JSON parsing.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+# Bit positions are persisted: only ever append to this list. SQLite integers
+# are 64-bit signed, so the column holds up to 63 achievements.
+ACHIEVEMENT_IDS = [
+    'first_quiz', 'perfect_score', 'streak_3', 'quiz_10', 'streak_7', 'first_purchase'
+]
+ACHIEVEMENT_BITS = {achievement: 1 << bit for bit, achievement in enumerate(ACHIEVEMENT_IDS)}
+
+
+def achievement_mask(achievements):
+    """Bitset for a collection of achievement ids (unknown ids are ignored)."""
+    mask = 0
+    for achievement in achievements:
+        mask |= ACHIEVEMENT_BITS.get(achievement, 0)
+    return mask
+
+
+def achievement_list(bits):
+    """Achievement ids set in `bits`, in catalogue order."""
+    return [achievement for achievement in ACHIEVEMENT_IDS if bits & ACHIEVEMENT_BITS[achievement]]
+
+
+@dataclass(slots=True)
+class InventoryItem:
+    item_id: str
+    item_type: Optional[str]
+    purchased_at: Optional[str]
+
+
+@dataclass(slots=True)
+class UserRecord:
+    username: str
+    password: str
+    coins: int = 0
+    level: int = 1
+    achievement_bits: int = 0
+    streak: int = 0
+    last_login: Optional[str] = None
+    version: int = 0
+    inventory: List[InventoryItem] = field(default_factory=list)
+    owned: Set[str] = field(default_factory=set)
+
+    def __post_init__(self):
+        if not self.owned:
+            self.owned = {item.item_id for item in self.inventory}
+
+    @property
+    def achievements(self):
+        return achievement_list(self.achievement_bits)
+
+    def has_achievement(self, achievement):
+        return bool(self.achievement_bits & ACHIEVEMENT_BITS.get(achievement, 0))
+
+    def owns(self, item_id):
+        return item_id in self.owned
+
+    def update(self, **fields):
+        """Apply column changes already written to the store."""
+        for name, value in fields.items():
+            setattr(self, name, value)
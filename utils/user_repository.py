@@ -0,0 +1,250 @@
+import json
+import threading
+from pathlib import Path
+from utils.database import DB_PATH, get_connection, transaction, run_once
+from utils.excel_reader import iter_chunks
+from utils.passwords import MIGRATION_ITERATIONS, hash_passwords, hash_plaintext_rows, is_hashed
+from utils.user_model import UserRecord, InventoryItem, achievement_mask
+
+USER_COLUMNS = [
+    'username', 'password', 'coins', 'level', 'achievement_bits', 'streak', 'last_login'
+]
+
+# Latest row version seen by this process for each user. Every write through
+# the repository (or the ledger) bumps users.version and records it here, so
+# session snapshots can be checked for staleness without touching the store.
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def note_version(username, version):
+    with _versions_lock:
+        _versions[username] = version
+
+
+def known_version(username):
+    """Latest version of the user's row known to this process, or None."""
+    return _versions.get(username)
+
+
+class UserRepository:
+    """SQLite-backed user store keyed by username.
+
+    Replaces the old data/users.xlsx workbook: every lookup and update touches
+    a single row through the primary-key index instead of the whole sheet.
+    Users come back as typed UserRecord objects; achievements live in the
+    `achievement_bits` column and purchases in the `user_inventory` table.
+    """
+
+    def __init__(self, db_path=DB_PATH, legacy_file="data/users.xlsx"):
+        self.db_path = db_path
+        self.legacy_file = legacy_file
+        self._create_schema()
+        run_once('import_users_xlsx', self._import_legacy_users, db_path)
+        run_once('hash_plaintext_passwords', hash_plaintext_rows, db_path)
+
+    def _create_schema(self):
+        conn = get_connection(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password TEXT NOT NULL,
+                coins INTEGER NOT NULL DEFAULT 0,
+                level INTEGER NOT NULL DEFAULT 1,
+                achievement_bits INTEGER NOT NULL DEFAULT 0,
+                streak INTEGER NOT NULL DEFAULT 0,
+                last_login TEXT,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Same layout as the user_inventory table already shipped in virtual_economy.db
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_inventory (
+                username TEXT,
+                item_id TEXT,
+                purchase_date DATE,
+                expiry_date DATE,
+                used BOOLEAN DEFAULT FALSE,
+                item_type TEXT
+            )
+        """)
+        if 'item_type' not in _columns(conn, 'user_inventory'):
+            conn.execute("ALTER TABLE user_inventory ADD COLUMN item_type TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_user_inventory_user ON user_inventory (username, item_id)"
+        )
+
+    def _import_legacy_users(self, conn):
+        """One-shot copy of the legacy users.xlsx rows into the users table.
+
+        The workbook kept passwords in plaintext; they are hashed on the way in
+        at the interim MIGRATION_ITERATIONS cost and upgraded at first login.
+        """
+        if not Path(self.legacy_file).exists():
+            return
+
+        count = 0
+        for chunk in iter_chunks(self.legacy_file):
+            records = [record for record in chunk if record.get('username') is not None]
+            passwords = [str(record.get('password', '')) for record in records]
+            plaintext = [i for i, password in enumerate(passwords) if not is_hashed(password)]
+            hashed = hash_passwords((passwords[i] for i in plaintext), MIGRATION_ITERATIONS)
+            for i, new_hash in zip(plaintext, hashed):
+                passwords[i] = new_hash
+
+            for record, password in zip(records, passwords):
+                bits, inventory = _parse_legacy_json(record.get('achievements'), record.get('inventory'))
+                self._insert(conn, UserRecord(
+                    username=str(record['username']),
+                    password=password,
+                    coins=_int_or(record.get('coins'), 0),
+                    level=_int_or(record.get('level'), 1),
+                    achievement_bits=bits,
+                    streak=_int_or(record.get('streak'), 0),
+                    last_login=_text_or(record.get('last_login'), None),
+                    inventory=inventory
+                ))
+                count += 1
+        print(f"Imported {count} users from {self.legacy_file}")
+
+    def _insert(self, conn, user):
+        cursor = conn.execute(
+            f"INSERT OR IGNORE INTO users ({', '.join(USER_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(USER_COLUMNS))})",
+            [getattr(user, column) for column in USER_COLUMNS]
+        )
+        if cursor.rowcount != 1:
+            return False
+        self._insert_items(conn, user.username, user.inventory)
+        return True
+
+    def _insert_items(self, conn, username, items):
+        conn.executemany(
+            "INSERT INTO user_inventory (username, item_id, item_type, purchase_date) "
+            "VALUES (?, ?, ?, ?)",
+            [(username, item.item_id, item.item_type, item.purchased_at) for item in items]
+        )
+
+    def get_user(self, username):
+        """Return the user as a UserRecord, or None if the user does not exist."""
+        conn = get_connection(self.db_path)
+        row = conn.execute(
+            f"SELECT {', '.join(USER_COLUMNS)}, version FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        if row is None:
+            return None
+        items = conn.execute(
+            "SELECT item_id, item_type, purchase_date FROM user_inventory "
+            "WHERE username = ? ORDER BY rowid",
+            (username,)
+        )
+        note_version(username, row['version'])
+        return UserRecord(**dict(row), inventory=[InventoryItem(*item) for item in items])
+
+    def exists(self, username):
+        return get_connection(self.db_path).execute(
+            "SELECT 1 FROM users WHERE username = ?", (username,)
+        ).fetchone() is not None
+
+    def create_user(self, user):
+        """Insert a new UserRecord (and its inventory). Returns False if the username is taken."""
+        with transaction(self.db_path) as conn:
+            created = self._insert(conn, user)
+        if created:
+            note_version(user.username, 0)
+        return created
+
+    def add_inventory_item(self, username, item):
+        """Append an InventoryItem to the user's inventory."""
+        with transaction(self.db_path) as conn:
+            self._insert_items(conn, username, [item])
+            row = conn.execute(
+                "UPDATE users SET version = version + 1 WHERE username = ? RETURNING version",
+                (username,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(username)
+        note_version(username, row['version'])
+
+    def update_user(self, username, **fields):
+        """Update the given columns of a single user row.
+
+        A row that already holds these values is left alone: no write and no
+        version bump, so cached session snapshots stay valid. Returns False
+        only if there is no such user.
+        """
+        unknown = set(fields) - set(USER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown user fields: {', '.join(sorted(unknown))}")
+        if not fields:
+            return False
+
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        changed = ' OR '.join(f"{column} IS NOT ?" for column in fields)
+        with transaction(self.db_path) as conn:
+            row = conn.execute(
+                f"UPDATE users SET {assignments}, version = version + 1 "
+                f"WHERE username = ? AND ({changed}) RETURNING version",
+                [*fields.values(), username, *fields.values()]
+            ).fetchone()
+        if row is None:
+            return self.exists(username)
+        note_version(username, row['version'])
+        return True
+
+    def compare_and_update(self, username, expected, **fields):
+        """Update the row only if the `expected` columns still hold those values.
+
+        Returns False when another session changed the row first.
+        """
+        unknown = (set(fields) | set(expected)) - set(USER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown user fields: {', '.join(sorted(unknown))}")
+
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        conditions = ''.join(f" AND {column} IS ?" for column in expected)
+        with transaction(self.db_path) as conn:
+            row = conn.execute(
+                f"UPDATE users SET {assignments}, version = version + 1 "
+                f"WHERE username = ?{conditions} RETURNING version",
+                [*fields.values(), username, *expected.values()]
+            ).fetchone()
+        if row is None:
+            return False
+        note_version(username, row['version'])
+        return True
+
+
+def _columns(conn, table):
+    return {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _parse_legacy_json(achievements, inventory):
+    """Achievement bitset and InventoryItems from the old JSON-in-cell columns."""
+    def load(value):
+        try:
+            return json.loads(_text_or(value, '[]'))
+        except (TypeError, ValueError):
+            return []
+
+    items = [
+        InventoryItem(item.get('item_id'), item.get('type'), item.get('purchased_at'))
+        for item in load(inventory) if isinstance(item, dict) and item.get('item_id')
+    ]
+    return achievement_mask(load(achievements)), items
+
+
+def _int_or(value, default):
+    try:
+        if value is None or value != value:  # NaN from empty Excel cells
+            return default
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _text_or(value, default):
+    if value is None or value != value:
+        return default
+    return str(value)
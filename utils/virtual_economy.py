@@ -1,9 +1,14 @@
-import json
-from pathlib import Path
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.motivation import show_motivation
+from utils.database import transaction
+from utils.user_repository import UserRepository
+from utils.user_model import InventoryItem
+from utils.ledger import CoinLedger, InsufficientFunds, PURCHASE
+from utils.achievements import AchievementEngine, PURCHASE_MADE
+from utils.streaks import DailyStreaks
+from utils import tracing
 
+@tracing.instrument('economy')
 class VirtualEconomy:
     def __init__(self):
         self.shop_items = {
@@ -21,7 +26,10 @@ class VirtualEconomy:
             }
         }
         
-        self.users_file = "data/users.xlsx"
+        self.users = UserRepository()
+        self.ledger = CoinLedger()
+        self.achievements = AchievementEngine(self.users, self.ledger)
+        self.streaks = DailyStreaks(self.achievements)
         
     def get_shop_items(self):
         """Return all available shop items"""
@@ -30,10 +38,6 @@ class VirtualEconomy:
     def purchase_item(self, username, item_id):
         """Process item purchase for a user"""
         try:
-            df = pd.read_excel(self.users_file)
-            user_row = df[df['username'] == username].index[0]
-            user_data = df.loc[user_row]
-            
             # Find item in shop
             for category in self.shop_items.values():
                 if item_id in category:
@@ -42,66 +46,68 @@ class VirtualEconomy:
             else:
                 return False, "Item not found"
             
-            # Check if user has enough coins
-            if user_data['coins'] < item['price']:
-                return False, "Not enough coins"
-            
-            # Update user's inventory and coins
-            inventory = json.loads(user_data['inventory']) if 'inventory' in user_data else []
-            inventory.append({
-                'item_id': item_id,
-                'purchased_at': datetime.now().isoformat(),
-                'type': item['type']
-            })
-            
-            # Deduct coins and update inventory
-            df.at[user_row, 'coins'] = user_data['coins'] - item['price']
-            df.at[user_row, 'inventory'] = json.dumps(inventory)
-            df.to_excel(self.users_file, index=False)
+            # The debit and the inventory change commit together or not at all
+            with transaction(self.users.db_path):
+                user_data = self.users.get_user(username)
+                if user_data is None:
+                    return False, "User not found"
+                
+                self.ledger.debit(username, item['price'], PURCHASE, item_id)
+                
+                self.users.add_inventory_item(
+                    username, InventoryItem(item_id, item['type'], datetime.now().isoformat())
+                )
+                self.achievements.handle(username, PURCHASE_MADE, item_id=item_id)
             
             return True, f"Successfully purchased {item['name']}"
+        except InsufficientFunds:
+            return False, "Not enough coins"
         except Exception as e:
             print(f"Error during purchase: {str(e)}")
             return False, f"Purchase failed: {str(e)}"
     
+    def get_balance(self, username):
+        """Coin balance derived from the user's ledger entries"""
+        return self.ledger.balance(username)
+    
+    def get_transaction_history(self, username, limit=20):
+        """Most recent coin transactions, newest first"""
+        return self.ledger.history(username, limit)
+    
     def get_user_inventory(self, username):
-        """Get user's purchased items"""
+        """Get user's purchased items as InventoryItem records"""
         try:
-            df = pd.read_excel(self.users_file)
-            user_data = df[df['username'] == username].iloc[0]
-            if 'inventory' in user_data:
-                return json.loads(user_data['inventory'])
-            return []
+            user_data = self.users.get_user(username)
+            return user_data.inventory if user_data else []
         except Exception as e:
             print(f"Error getting inventory: {str(e)}")
             return []
     
-    def check_daily_streak(self, username):
-        """Check and update user's daily streak"""
+    def check_daily_streak(self, username, user_data=None):
+        """Mark the user active today and return their current streak.
+
+        Pass an already loaded `user_data` record to skip the read; it is
+        updated in place with the new streak and coin values. Runs on every
+        sidebar render; streaks and bonuses are settled for everyone by the
+        daily rollover (see DailyStreaks), so only the first visit of a day
+        writes.
+        """
         try:
-            df = pd.read_excel(self.users_file)
-            user_row = df[df['username'] == username].index[0]
-            user_data = df.loc[user_row]
-            
-            last_login = user_data.get('last_login')
-            current_streak = user_data.get('streak', 0)
-            
-            today = datetime.now().date()
-            if last_login:
-                last_login_date = datetime.fromisoformat(last_login).date()
-                if today - last_login_date == timedelta(days=1):
-                    current_streak += 1
-                    bonus_coins = min(current_streak * 10, 100)  # Cap at 100 coins
-                    df.at[user_row, 'coins'] = user_data['coins'] + bonus_coins
-                    df.at[user_row, 'streak'] = current_streak
-                elif today - last_login_date > timedelta(days=1):
-                    current_streak = 1
-                    df.at[user_row, 'streak'] = current_streak
-            
-            df.at[user_row, 'last_login'] = today.isoformat()
-            df.to_excel(self.users_file, index=False)
-            
-            return current_streak
+            self.streaks.catch_up()
+            if user_data is None:
+                user_data = self.users.get_user(username)
+            if user_data is None:
+                return 0
+
+            today = datetime.now().date().isoformat()
+            if user_data.last_login != today:
+                self.users.update_user(username, last_login=today)
+                # Also picks up what the rollover did to the cached record
+                latest = self.users.get_user(username)
+                user_data.update(**{column: getattr(latest, column) for column in
+                                    ('coins', 'streak', 'last_login', 'version')})
+
+            return user_data.streak
         except Exception as e:
             print(f"Error checking streak: {str(e)}")
             return 0